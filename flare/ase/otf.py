@@ -216,7 +216,7 @@ class ASE_OTF(OTF):
         super().rescale_temperature(new_pos)
 
         # update ASE atoms
-        if self.curr_step in self.rescale_steps:
+        if self.curr_step in self._rescale_steps_set:
             rescale_ind = self.rescale_steps.index(self.curr_step)
             new_temp = self.rescale_temps[rescale_ind]
             temp_fac = new_temp / self.temperature
@@ -287,27 +287,27 @@ class ASE_OTF(OTF):
 
     def as_dict(self):
 
-        # DFT module and Trajectory will cause issue in deepcopy
-        self.dft_module = self.dft_module.__name__
-        md = self.md
-        self.md = None
-
-        # SGP models aren't picklable. Temporarily set to None before copying.
-        flare_calc = self.flare_calc
-        gp = self.gp
-        self.flare_calc = None
-        self.gp = None
-        self.atoms.calc = None
-
-        # Deepcopy OTF object.
-        dct = deepcopy(dict(vars(self)))
-
-        # Reset attributes.
-        self.dft_module = eval(self.dft_module)
-        self.md = md
-        self.flare_calc = flare_calc
-        self.gp = gp
-        self.atoms.calc = flare_calc
+        # Models, calculators, atoms and the MD engine are written to separate
+        # files or not at all (SGP models aren't picklable, and Trajectory
+        # will cause issue in deepcopy), so they are left out of the copy.
+        skipped = [
+            "gp",
+            "flare_calc",
+            "atoms",
+            "structure",
+            "md",
+            "dft_module",
+            "dft_loc",
+            "dft_input",
+            "output",
+            "_log",
+            "pred_func",
+            "_rescale_steps_set",
+        ]
+        dct = deepcopy(
+            {key: value for key, value in vars(self).items() if key not in skipped}
+        )
+        dct["dft_module"] = self.dft_module.__name__
 
         # write atoms and flare calculator to separate files
         write(self.atoms_name, self.atoms)
@@ -323,9 +323,6 @@ class ASE_OTF(OTF):
 
         dct["gp"] = self.gp_name
 
-        for key in ["output", "pred_func", "structure", "dft_input", "md"]:
-            dct.pop(key)
-
         return dct
 
     @staticmethod
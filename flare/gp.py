@@ -13,6 +13,7 @@ from flare.gp_algebra import (
     get_like_from_mats,
     get_neg_like_grad,
     get_ky_mat_update,
+    extend_L_inv,
     _global_training_data,
     _global_training_labels,
     _global_training_structures,
@@ -76,6 +77,13 @@ class GaussianProcess:
             memory access.
     """
 
+    # Counter of the changes made to the training set through update_db,
+    # add_one_env, add_envs and remove_force_data, and the key of the
+    # training set the covariance matrix was last computed for. Defined on
+    # the class so that models pickled without them can still be updated.
+    _training_version = 0
+    _ky_mat_key = None
+
     def __init__(
         self,
         kernels: List[str] = None,
@@ -398,6 +406,7 @@ class GaussianProcess:
         self.all_labels = np.concatenate(
             (self.training_labels_np, self.energy_labels_np)
         )
+        self._training_version += 1
         self.sync_data()
 
     def add_one_env(
@@ -424,6 +433,44 @@ class GaussianProcess:
         else:
             self.training_labels.append(force)
         self.training_labels_np = np.hstack(self.training_labels)
+        self._training_version += 1
+        self.sync_data()
+
+        # update list of all labels
+        self.all_labels = np.concatenate(
+            (self.training_labels_np, self.energy_labels_np)
+        )
+
+        if train:
+            self.train(**kwargs)
+
+    def add_envs(
+        self,
+        envs: List[AtomicEnvironment],
+        forces: "np.ndarray" = None,
+        train: bool = False,
+        **kwargs,
+    ):
+        """Add a list of local environments to the training set of the GP,
+        updating the training labels only once.
+
+        Args:
+            envs (List[AtomicEnvironment]): Local environments to be added to
+                the training set of the GP.
+            forces (np.ndarray): Forces on the central atoms of the local
+                environments, of shape (len(envs), 3). If None, the forces
+                stored in the environments are used.
+            train (bool): If True, the GP is trained after the local
+                environments are added.
+        """
+        if forces is None:
+            forces = [env.force for env in envs]
+        assert len(forces) == len(envs), "Need one force per environment."
+
+        self.training_data.extend(envs)
+        self.training_labels.extend(forces)
+        self.training_labels_np = np.hstack(self.training_labels)
+        self._training_version += 1
         self.sync_data()
 
         # update list of all labels
@@ -659,17 +706,73 @@ class GaussianProcess:
 
     def predict_force_xyz(self, x_t: AtomicEnvironment) -> ("np.ndarray", "np.ndarray"):
         """
-        Simple wrapper to predict all three components of a force in one go.
-        :param x_t:
-        :return:
+        Predict all three components of a force in one go, as a batch of one
+        environment passed to predict_forces_xyz.
+        :param x_t: Input local environment.
+        :return: Means and epistemic variances of the x, y and z components.
+        """
+
+        forces, variances = self.predict_forces_xyz([x_t])
+
+        return forces[0], variances[0]
+
+    def predict_forces_xyz(
+        self, envs: List[AtomicEnvironment]
+    ) -> ("np.ndarray", "np.ndarray"):
+        """
+        Predict all three force components of several local environments.
+        The kernel vectors of every environment are stacked into one matrix,
+        so the means and variances of the whole batch are obtained from one
+        matrix product each with alpha and the inverse covariance matrix.
+
+        Args:
+            envs (List[AtomicEnvironment]): Input local environments.
+
+        Return:
+            (np.ndarray, np.ndarray): Means and epistemic variances of the
+                force components, each of shape (len(envs), 3).
         """
-        forces = []
-        stds = []
-        for d in (1, 2, 3):
-            force, std = self.predict(x_t, d)
-            forces.append(force)
-            stds.append(std)
-        return np.array(forces), np.array(stds)
+
+        if self.parallel and not self.per_atom_par:
+            n_cpus = self.n_cpus
+        else:
+            n_cpus = 1
+
+        self.sync_data()
+
+        k_mat = np.array(
+            [
+                get_kernel_vector(
+                    self.name,
+                    self.kernel,
+                    self.energy_force_kernel,
+                    x_t,
+                    d,
+                    self.hyps,
+                    cutoffs=self.cutoffs,
+                    hyps_mask=self.hyps_mask,
+                    n_cpus=n_cpus,
+                    n_sample=self.n_sample,
+                )
+                for x_t in envs
+                for d in (1, 2, 3)
+            ]
+        )
+
+        # Guarantee that alpha is up to date with training set
+        self.check_L_alpha()
+
+        forces = np.matmul(k_mat, self.alpha)
+
+        args = from_mask_to_args(self.hyps, self.cutoffs, self.hyps_mask)
+        self_kerns = np.array(
+            [self.kernel(x_t, x_t, d, d, *args) for x_t in envs for d in (1, 2, 3)]
+        )
+        variances = self_kerns - np.sum(
+            np.matmul(k_mat, self.ky_mat_inv) * k_mat, axis=1
+        )
+
+        return forces.reshape(-1, 3), variances.reshape(-1, 3)
 
     def predict_local_energy(self, x_t: AtomicEnvironment) -> float:
         """Predict the local energy of a local environment.
@@ -833,6 +936,20 @@ class GaussianProcess:
 
         self.likelihood = get_like_from_mats(ky_mat, l_mat, alpha, self.name)
         self.n_envs_prev = len(self.training_data)
+        self._ky_mat_key = self._training_set_key()
+
+    def _training_set_key(self) -> tuple:
+        """
+        Key of the current training set and hyperparameters: the update
+        counter, and the training lists and hyperparameter array themselves,
+        so that replacing any of them is noticed as well.
+        """
+        return (
+            self._training_version,
+            self.training_data,
+            self.training_structures,
+            self.hyps,
+        )
 
     def update_L_alpha(self):
         """
@@ -845,9 +962,31 @@ class GaussianProcess:
             self.set_L_alpha()
             return
 
+        # The covariance matrix can only be extended if the training lists
+        # and hyperparameters it was computed with are still in place.
+        key = self._ky_mat_key
+        if key is not None and any(
+            old is not new for old, new in zip(key[1:], self._training_set_key()[1:])
+        ):
+            self.set_L_alpha()
+            return
+
         # Reset global variables.
         self.sync_data()
 
+        # The covariance matrix of an unchanged training set can be reused;
+        # only the labels may have changed.
+        n_labels = 3 * len(self.training_data) + len(self.training_structures)
+        if (
+            self.ky_mat_inv is not None
+            and key is not None
+            and key[0] == self._training_version
+            and len(self.training_data) == self.n_envs_prev
+            and n_labels == len(self.ky_mat)
+        ):
+            self.alpha = np.matmul(self.ky_mat_inv, self.all_labels)
+            return
+
         ky_mat = get_ky_mat_update(
             self.ky_mat,
             self.n_envs_prev,
@@ -863,9 +1002,25 @@ class GaussianProcess:
             n_sample=self.n_sample,
         )
 
-        l_mat = np.linalg.cholesky(ky_mat)
-        l_mat_inv = np.linalg.inv(l_mat)
-        ky_mat_inv = l_mat_inv.T @ l_mat_inv
+        # If only force labels were in the old covariance matrix, it is the
+        # leading block of the new one, and L and the inverse covariance
+        # matrix can be extended instead of recomputed.
+        n_prev = len(self.ky_mat)
+        if (
+            self.ky_mat_inv is not None
+            and n_prev == 3 * self.n_envs_prev
+            and len(ky_mat) > n_prev
+        ):
+            l_mat, ky_mat_inv = extend_L_inv(
+                self.l_mat,
+                self.ky_mat_inv,
+                ky_mat[:n_prev, n_prev:],
+                ky_mat[n_prev:, n_prev:],
+            )
+        else:
+            l_mat = np.linalg.cholesky(ky_mat)
+            l_mat_inv = np.linalg.inv(l_mat)
+            ky_mat_inv = l_mat_inv.T @ l_mat_inv
         alpha = np.matmul(ky_mat_inv, self.all_labels)
 
         self.ky_mat = ky_mat
@@ -873,6 +1028,7 @@ class GaussianProcess:
         self.alpha = alpha
         self.ky_mat_inv = ky_mat_inv
         self.n_envs_prev = len(self.training_data)
+        self._ky_mat_key = self._training_set_key()
 
     def __str__(self):
         """String representation of the GP model."""
@@ -902,6 +1058,9 @@ class GaussianProcess:
         self.check_L_alpha()
 
         out_dict = dict(vars(self))
+        # Change markers of the training set only apply to this instance
+        out_dict.pop("_training_version", None)
+        out_dict.pop("_ky_mat_key", None)
 
         out_dict["training_data"] = [env.as_dict() for env in self.training_data]
 
@@ -1154,6 +1313,7 @@ class GaussianProcess:
         self.all_labels = np.concatenate(
             (self.training_labels_np, self.energy_labels_np)
         )
+        self._training_version += 1
         self.sync_data()
 
         if update_matrices:
@@ -1296,14 +1456,17 @@ class GaussianProcess:
 
         data["N"] = len(self.training_data)
 
-        # Count all of the present species in the atomic env. data
-        present_species = []
-        for env, _ in zip(self.training_data, self.training_labels):
-            present_species.append(Z_to_element(env.structure.coded_species[env.atom]))
+        # Count all of the present species in the atomic env. data, naming
+        # each species once rather than once per environment
+        counts_by_Z = Counter(
+            env.structure.coded_species[env.atom]
+            for env, _ in zip(self.training_data, self.training_labels)
+        )
+        envs_by_species = {Z_to_element(Z): n for Z, n in counts_by_Z.items()}
 
         # Summarize the relevant information
-        data["species"] = list(set(present_species))
-        data["envs_by_species"] = dict(Counter(present_species))
+        data["species"] = list(envs_by_species)
+        data["envs_by_species"] = envs_by_species
 
         return data
 
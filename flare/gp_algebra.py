@@ -5,6 +5,7 @@ import numpy as np
 import time
 
 from typing import List, Callable
+from scipy.linalg import solve_triangular
 from flare.kernels.utils import from_mask_to_args, from_grad_to_mask
 
 _global_training_data = {}
@@ -1098,6 +1099,47 @@ def get_ky_mat_update(
     return ky_mat
 
 
+def extend_L_inv(
+    l_mat: np.ndarray, ky_mat_inv: np.ndarray, k12: np.ndarray, k22: np.ndarray
+):
+    """
+    Extend the Cholesky factor and the inverse of a covariance matrix K to
+    those of the bordered matrix [[K, k12], [k12^T, k22]], in O(n^2 b) time
+    for n old and b new rows instead of refactorizing in O(n^3).
+
+    :param l_mat: lower triangular Cholesky factor of K
+    :param ky_mat_inv: inverse of K
+    :param k12: covariance between the old and new rows, shape (n, b)
+    :param k22: covariance of the new rows, shape (b, b)
+
+    :return: the extended Cholesky factor and inverse covariance matrix
+    """
+
+    n_old = len(l_mat)
+    n_new = n_old + len(k22)
+
+    # Cholesky factor: [[L, 0], [S12^T, S22]]
+    s12 = solve_triangular(l_mat, k12, lower=True)
+    s22 = np.linalg.cholesky(k22 - s12.T @ s12)
+    l_mat_new = np.zeros((n_new, n_new))
+    l_mat_new[:n_old, :n_old] = l_mat
+    l_mat_new[n_old:, :n_old] = s12.T
+    l_mat_new[n_old:, n_old:] = s22
+
+    # Inverse from the Schur complement S22 S22^T of K
+    kinv_k12 = ky_mat_inv @ k12
+    s22_inv = solve_triangular(s22, np.eye(len(k22)), lower=True)
+    schur_inv = s22_inv.T @ s22_inv
+    off_diag = -kinv_k12 @ schur_inv
+    ky_mat_inv_new = np.empty((n_new, n_new))
+    ky_mat_inv_new[:n_old, :n_old] = ky_mat_inv - off_diag @ kinv_k12.T
+    ky_mat_inv_new[:n_old, n_old:] = off_diag
+    ky_mat_inv_new[n_old:, :n_old] = off_diag.T
+    ky_mat_inv_new[n_old:, n_old:] = schur_inv
+
+    return l_mat_new, ky_mat_inv_new
+
+
 # --------------------------------------------------------------------------
 #                            Kernel vectors
 # --------------------------------------------------------------------------
@@ -34,14 +34,18 @@ of atoms which are added from a given seed frame.
 """
 import json as json
 import logging
+import multiprocessing as mp
 import numpy as np
 import time
 import warnings
 
-from copy import deepcopy
+from collections import defaultdict
+from copy import copy
+from functools import partial
 from math import inf
-from typing import List, Tuple, Union, Dict
-from random import sample
+from typing import List, Tuple, Union, Dict, Iterable, Iterator
+
+from numba import njit
 
 from flare.env import AtomicEnvironment
 from flare.gp import GaussianProcess
@@ -50,14 +54,17 @@ from flare.predict import (
     predict_on_structure_par,
     predict_on_structure_par_en,
     predict_on_structure_mgp,
+    predict_on_structures_par,
 )
 from flare.struc import Structure, Trajectory
-from flare.utils.element_coder import element_to_Z, Z_to_element, NumpyEncoder
+from flare.utils.element_coder import element_to_Z, Z_to_element, numpy_dumps
 from flare.utils.learner import (
     subset_of_frame_by_element,
+    indices_by_species,
     is_std_in_bound_per_species,
     is_force_in_bound_per_species,
     evaluate_training_atoms,
+    force_errors,
 )
 from flare.mgp import MappedGaussianProcess
 from flare.parameters import Parameters
@@ -97,6 +104,9 @@ class TrajectoryTrainer:
         atom_checkpoint_interval: int = 100,
         print_training_plan: bool = True,
         model_format: str = "pickle",
+        seed: int = None,
+        error_dtype: "np.dtype" = np.float64,
+        predict_dtype: "np.dtype" = np.float64,
     ):
         """
         Class which trains a GP off of an AIMD trajectory, and generates
@@ -152,12 +162,30 @@ class TrajectoryTrainer:
             triggered uncertainty or force conditions, so that training can
             be 'fast-forwarded' later. Also useful for gauging MGP results and
             then applying the atoms with high uncertainty and error to a GP.
+            The plan is a dict mapping each triggering frame to the
+            [atom, uncertainties, errors] of its training atoms, streamed to
+            {output_name}_training_plan.json one frame at a time.
+        :param seed: Seed of the random number generator used to shuffle
+            frames and choose atoms to add from seed / passive frames
+        :param error_dtype: Precision of the force errors reported by
+            run / run_active_learning in the output and training plan, e.g.
+            np.float32 to halve their size; training atoms are always
+            selected with float64 errors
+        :param predict_dtype: Precision the predicted forces, uncertainties
+            and local energies are kept in for thresholding and output, also
+            used for the pred_forces / pred_stds arrays of
+            run_active_learning; np.float32 halves their memory traffic. DFT
+            labels added to the GP, and the dft_forces array, keep float64
+            precision.
         """
 
+        # Random number generator for frame shuffling and atom selection
+        self.rng = np.random.default_rng(seed)
+
         # Set up parameters
         self.frames = frames
         if shuffle_frames:
-            np.random.shuffle(frames)
+            self.rng.shuffle(frames)
             if print_training_plan:
                 warnings.warn(
                     "Frames are shuffled so training plan will not"
@@ -181,7 +209,23 @@ class TrajectoryTrainer:
         self.train_count = 0
         self.calculate_energy = calculate_energy
         self.n_cpus = n_cpus
+        # Process pool reused by parallel predictions, opened during runs
+        self._pool = None
+        # Training statistics of the GP, cached until its training set changes
+        self._gp_stats_cache = None
+        self._gp_stats_json_cache = None
+        # Noise hyperparameter of the GP, cached until it is retrained
+        self._noise_cache = None
+        # Element names of the atomic numbers seen in update_gp_and_print
+        self._element_names = {}
         self.include_energies = include_energies
+        self.error_dtype = error_dtype
+        self.predict_dtype = predict_dtype
+        # Predicted forces / stds and DFT forces of the frames of the last
+        # active learning run, stacked into (frames, atoms, 3) arrays
+        self.pred_forces = None
+        self.pred_stds = None
+        self.dft_forces = None
 
         if parallel is True:
             warnings.warn(
@@ -292,8 +336,8 @@ class TrajectoryTrainer:
         logger.debug("Beginning passive learning.")
         # If seed environments were passed in, add them to the GP.
 
-        for env in environments:
-            self.gp.add_one_env(env, env.force, train=False)
+        if environments:
+            self.gp.add_envs(environments, train=False)
 
         # Ensure compatibility with number / symbol elemental notation
         for cur_dict in [max_elts_per_frame, max_model_elts]:
@@ -303,33 +347,45 @@ class TrajectoryTrainer:
                 elif isinstance(key, str):
                     cur_dict[element_to_Z(key)] = cur_dict[key]
 
+        # Index the user defined cutoffs by atomic number
+        n_Z = 1 + max(
+            [118]
+            + [element_to_Z(key) for key in {**max_elts_per_frame, **max_model_elts}]
+            + [int(np.max(frame.coded_species)) for frame in frames if len(frame)]
+        )
+        cap_per_frame_by_Z = _counts_by_Z(max_elts_per_frame, n_Z, inf)
+        cap_model_by_Z = _counts_by_Z(max_model_elts, n_Z, inf)
+
         # Main frame loop
         total_added = 0
         for frame in frames:
-            current_stats = self.gp.training_statistics
-            available_to_add = max_model_size - current_stats["N"]
+            current_stats = self._training_statistics
+            envs_by_Z = _counts_by_Z(current_stats["envs_by_species"], n_Z, 0)
+            index_map = indices_by_species(frame)
 
-            train_atoms = []
-            for species_i in set(frame.coded_species):
-                # Get a randomized set of atoms of species i from the frame
-                # So that it is not always the lowest-indexed atoms chosen
-                elt = Z_to_element(species_i)
-                atoms_of_specie = frame.indices_of_specie(species_i)
-                n_at = len(atoms_of_specie)
-                # Determine how many to add based on user defined cutoffs
-                n_add = min(
-                    n_at,
-                    max_elts_per_frame.get(species_i, inf),
-                    max_atoms_per_frame - len(train_atoms),
-                    available_to_add - len(train_atoms),
-                    max_model_elts.get(elt, np.inf)
-                    - current_stats["envs_by_species"].get(elt, 0),
-                )
-                n_add = max(0, n_add)
+            species = np.fromiter(index_map.keys(), dtype=np.intp)
+            species_counts = np.array(
+                [len(atoms) for atoms in index_map.values()], dtype=np.int64
+            )
+
+            # Determine how many to add based on user defined cutoffs
+            n_add_by_species = _plan_species_counts(
+                species_counts,
+                cap_per_frame_by_Z[species],
+                cap_model_by_Z[species] - envs_by_Z[species],
+                _to_count(max_atoms_per_frame),
+                _to_count(max_model_size - current_stats["N"]),
+            )
 
-                train_atoms += sample(atoms_of_specie, n_add)
-                available_to_add -= n_add
-                total_added += n_add
+            # Get a randomized set of atoms of each species from the frame
+            # So that it is not always the lowest-indexed atoms chosen
+            picked = [
+                self.rng.choice(atoms_of_specie, size=n_add, replace=False)
+                for atoms_of_specie, n_add in zip(index_map.values(), n_add_by_species)
+            ]
+            total_added += int(n_add_by_species.sum())
+
+            train_atoms = np.concatenate(picked).tolist() if picked else []
 
             self.update_gp_and_print(
                 frame=frame,
@@ -339,12 +395,13 @@ class TrajectoryTrainer:
             )
 
         logger = logging.getLogger(self.logger_name)
-        logger.info(
-            f"Added {total_added} atoms to "
-            "GP.\n"
-            "Current GP Statistics: "
-            f"{json.dumps(self.gp.training_statistics)} "
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Added {total_added} atoms to "
+                "GP.\n"
+                "Current GP Statistics: "
+                f"{self._training_statistics_json} "
+            )
 
         if post_training_iterations:
             logger.debug(
@@ -380,6 +437,7 @@ class TrajectoryTrainer:
         write_model_atom_interval: int = 100,
         validate_ratio: float = 0,
         post_write: bool = True,
+        predict_batch_size: int = 8,
     ):
 
         # Perform pre-run, in which seed trames are used.
@@ -399,181 +457,332 @@ class TrajectoryTrainer:
                 frames[0:1], max_model_elts={elt: 1 for elt in frames[0].species_labels}
             )
 
+        # The forces and uncertainties of the frames are replaced while they
+        # are predicted on, so the trajectory holds shallow copies of the
+        # frames passed in; their arrays are shared but not modified.
         if isinstance(frames, list):
-            frames = Trajectory(deepcopy(frames))
+            frames = Trajectory([copy(frame) for frame in frames])
 
         train_frame = int(len(frames) * (1 - validate_ratio))
 
+        # Store the predictions of every frame in contiguous arrays if the
+        # frames all have the same number of atoms
+        frame_sizes = {frame.nat for frame in frames}
+        if len(frame_sizes) == 1:
+            traj_shape = (len(frames), frame_sizes.pop(), 3)
+            self.pred_forces = np.full(traj_shape, np.nan, dtype=self.predict_dtype)
+            self.pred_stds = np.full(traj_shape, np.nan, dtype=self.predict_dtype)
+            self.dft_forces = np.full(traj_shape, np.nan)
+        else:
+            self.pred_forces = self.pred_stds = self.dft_forces = None
+
         # Loop through trajectory.
         train_model_atom_counter = 0  # Track atoms added for training
         write_model_atom_counter = 0  # Track atoms added for writing
         train_counter = 0  # Track # of times training done
 
-        # Keep track of which atoms trigger force / uncertainty condition
-        training_plan = {}
-
-        # MAIN LOOP - Frames
-        for i, cur_frame in enumerate(frames):
-            frame_start_time = time.time()
-            logger.info(f"=====NOW ON FRAME {i}=====")
-
-            # If no predict_atoms_per_element was specified, predict_atoms
-            # will be equal to every atom in the frame.
-            predict_atoms = subset_of_frame_by_element(cur_frame, predict_atoms_per_elt)
-
-            # Atoms which are skipped will have NaN as their force / std values
-            local_energies = None
-
-            # Three different predictions: Either MGP, GP with energy,
-            # or GP without
-            if self.gp_is_mapped:
-                pred_forces, pred_stds, local_energies = self.pred_func(
-                    structure=cur_frame,
-                    mgp=self.gp,
-                    write_to_structure=False,
-                    selective_atoms=predict_atoms,
-                    skipped_atom_value=np.nan,
-                    energy=True,
-                )
-            elif self.calculate_energy:
-                pred_forces, pred_stds, local_energies = self.pred_func(
-                    structure=cur_frame,
-                    gp=self.gp,
-                    n_cpus=self.n_cpus,
-                    write_to_structure=False,
-                    selective_atoms=predict_atoms,
-                    skipped_atom_value=np.nan,
-                )
-            else:
-                pred_forces, pred_stds = self.pred_func(
-                    structure=cur_frame,
-                    gp=self.gp,
-                    n_cpus=self.n_cpus,
-                    write_to_structure=False,
-                    selective_atoms=predict_atoms,
-                    skipped_atom_value=np.nan,
-                )
-
-            # Get Error
-            dft_forces = cur_frame.forces
-            dft_energy = cur_frame.energy
-            force_error = np.abs(pred_forces - dft_forces)
-
-            # Create dummy frame with the predicted forces written
-            dummy_frame = deepcopy(cur_frame)
-            dummy_frame.forces = pred_forces
-            dummy_frame.stds = pred_stds
-            cur_frame.stds = pred_stds
-
-            self.output.write_gp_dft_comparison(
-                curr_step=i,
-                frame=dummy_frame,
-                start_time=frame_start_time,
-                dft_forces=dft_forces,
-                dft_energy=dft_energy,
-                error=force_error,
-                local_energies=local_energies,
-                KE=0,
-                cell=cur_frame.cell,
+        # Keep track of which atoms trigger force / uncertainty condition,
+        # written frame by frame as they are found
+        training_plan = None
+        if self.print_training_plan:
+            training_plan = _TrainingPlanWriter(
+                f"{self.output_name}_training_plan.json"
             )
 
-            logger.debug(
-                f"Single frame calculation time {time.time()-frame_start_time}"
+        try:
+            # Keep one process pool for the parallel predictions of the whole run
+            self._open_pool()
+            predictions = _AheadPredictions(
+                self, frames, train_frame, predict_batch_size, predict_atoms_per_elt
             )
 
-            if i < train_frame:
-                # Noise hyperparameter & relative std tolerance is not for gp_is_mapped.
-                if self.gp_is_mapped:
-                    noise = 0
-                else:
-                    noise = Parameters.get_noise(
-                        self.gp.hyps_mask, self.gp.hyps, constraint=False
+            # MAIN LOOP - Frames
+            for i, cur_frame in enumerate(frames):
+                frame_start_time = time.time()
+                logger.info(f"=====NOW ON FRAME {i}=====")
+
+                pred_forces, pred_stds, local_energies = predictions.predict(i)
+                pred_forces, pred_stds, local_energies = self._as_predict_dtype(
+                    pred_forces, pred_stds, local_energies
+                )
+
+                # Get Error
+                dft_forces = cur_frame.forces
+                dft_energy = cur_frame.energy
+                # Select atoms with the float64 errors; only the reported
+                # errors are cast to error_dtype
+                force_error, max_error_by_atom = force_errors(pred_forces, dft_forces)
+                force_error = force_error.astype(self.error_dtype, copy=False)
+                if self.pred_forces is not None:
+                    self.pred_forces[i] = pred_forces
+                    self.pred_stds[i] = pred_stds
+                    self.dft_forces[i] = dft_forces
+
+                # Write the predicted forces to the frame for output, and
+                # restore the DFT forces afterwards
+                cur_frame.forces = pred_forces
+                cur_frame.stds = pred_stds
+                try:
+                    self.output.write_gp_dft_comparison(
+                        curr_step=i,
+                        frame=cur_frame,
+                        start_time=frame_start_time,
+                        dft_forces=dft_forces,
+                        dft_energy=dft_energy,
+                        error=force_error,
+                        local_energies=local_energies,
+                        KE=0,
+                        cell=cur_frame.cell,
                     )
+                finally:
+                    cur_frame.forces = dft_forces
 
-                in_bound, train_atoms = evaluate_training_atoms(
-                    rel_std_tolerance=rel_std_tolerance,
-                    abs_std_tolerance=abs_std_tolerance,
-                    noise=noise,
-                    abs_force_tolerance=abs_force_tolerance,
-                    max_force_error=max_force_error,
-                    pred_forces=pred_forces,
-                    dft_forces=dft_forces,
-                    structure=dummy_frame,
-                    max_model_elts=max_model_elts,
-                    max_atoms_from_frame=max_atoms_from_frame,
-                    max_elts_per_frame=max_elts_per_frame,
-                    training_statistics=self.gp.training_statistics,
+                logger.debug(
+                    f"Single frame calculation time {time.time()-frame_start_time}"
                 )
 
-                # Protocol for adding atoms to training set
-                if not in_bound:
+                if i < train_frame:
+                    # Noise hyperparameter & relative std tolerance is not for
+                    # gp_is_mapped.
+                    noise = self._noise
+
+                    in_bound, train_atoms = evaluate_training_atoms(
+                        rel_std_tolerance=rel_std_tolerance,
+                        abs_std_tolerance=abs_std_tolerance,
+                        noise=noise,
+                        abs_force_tolerance=abs_force_tolerance,
+                        max_force_error=max_force_error,
+                        pred_forces=pred_forces,
+                        dft_forces=dft_forces,
+                        structure=cur_frame,
+                        max_model_elts=max_model_elts,
+                        max_atoms_from_frame=max_atoms_from_frame,
+                        max_elts_per_frame=max_elts_per_frame,
+                        training_statistics=self._training_statistics,
+                        max_force_errors=max_error_by_atom,
+                    )
 
-                    # Record frame and training atoms, uncertainty, error
-                    force_errors = list(np.abs(pred_forces - dft_forces))
-                    uncertainties = list(dummy_frame.stds)
-                    training_plan[int(i)] = [
-                        (int(a), uncertainties[a], force_errors[a]) for a in train_atoms
-                    ]
+                    # Protocol for adding atoms to training set
+                    if not in_bound:
 
-                    if self.gp_is_mapped:
-                        continue
+                        # Record frame and training atoms, uncertainty, error
+                        train_idx = np.asarray(train_atoms, dtype=np.intp)
+                        train_stds = pred_stds[train_idx]
+                        if training_plan is not None:
+                            training_plan.write(
+                                i, train_idx, train_stds, force_error[train_idx]
+                            )
 
-                    if len(self.gp) + len(train_atoms) <= max_model_size:
-                        self.update_gp_and_print(
-                            cur_frame,
-                            train_atoms=train_atoms,
-                            uncertainties=pred_stds[train_atoms],
-                            train=False,
-                        )
-                    else:
-                        logger.info(
-                            f"GP is at maximum model size of {max_model_size}. "
-                            f"No further atoms will be added for "
-                            f"remainder of run, but predictions will still be "
-                            f"made. Setting max_atoms_from_frame "
-                            f"to 0."
-                        )
-                        max_atoms_from_frame = 0
-                        if self.model_format:
-                            self.gp.write_model(
-                                f"{self.output_name}_saturated", self.model_format
+                        if self.gp_is_mapped:
+                            continue
+
+                        # Predictions made ahead of time are out of date once
+                        # the GP is updated
+                        predictions.discard()
+                        if len(self.gp) + len(train_atoms) <= max_model_size:
+                            self.update_gp_and_print(
+                                cur_frame,
+                                train_atoms=train_atoms,
+                                uncertainties=train_stds,
+                                train=False,
                             )
-                    train_model_atom_counter += len(train_atoms)
-                    write_model_atom_counter += len(train_atoms)
-
-                    # Re-train if number of sampled atoms is high enough
-                    if (
-                        train_model_atom_counter >= min_atoms_per_train
-                        or (i + 1) == train_frame
-                        and train_counter <= max_trains
-                    ):
-                        self.train_gp()
-                        train_counter += 1
-                        train_model_atom_counter = 0
-                    else:
-                        self.gp.update_L_alpha()
-                    written = self.write_model_decision(
-                        write_model_train_interval,
-                        write_model_atom_counter,
-                        write_model_atom_interval,
-                        train_counter,
-                    )
-                    if written:
-                        write_model_atom_counter = 0
+                        else:
+                            logger.info(
+                                f"GP is at maximum model size of {max_model_size}. "
+                                f"No further atoms will be added for "
+                                f"remainder of run, but predictions will still be "
+                                f"made. Setting max_atoms_from_frame "
+                                f"to 0."
+                            )
+                            max_atoms_from_frame = 0
+                            if self.model_format:
+                                self.gp.write_model(
+                                    f"{self.output_name}_saturated", self.model_format
+                                )
+                        train_model_atom_counter += len(train_atoms)
+                        write_model_atom_counter += len(train_atoms)
+
+                        # Re-train if number of sampled atoms is high enough
+                        if (
+                            train_model_atom_counter >= min_atoms_per_train
+                            or (i + 1) == train_frame
+                            and train_counter <= max_trains
+                        ):
+                            self.train_gp()
+                            train_counter += 1
+                            train_model_atom_counter = 0
+                        else:
+                            self.gp.update_L_alpha()
+                        written = self.write_model_decision(
+                            write_model_train_interval,
+                            write_model_atom_counter,
+                            write_model_atom_interval,
+                            train_counter,
+                        )
+                        if written:
+                            write_model_atom_counter = 0
+
+        finally:
+            self._close_pool()
+            if training_plan is not None:
+                training_plan.close()
 
         # Print training statistics for GP model used
-        conclusion_strings = [
-            "Final GP statistics:" + json.dumps(self.gp.training_statistics)
-        ]
+        conclusion_strings = ["Final GP statistics:" + self._training_statistics_json]
         self.output.conclude_run(conclusion_strings)
 
-        if self.print_training_plan:
-            with open(f"{self.output_name}_training_plan.json", "w") as f:
-                f.write(json.dumps(training_plan, cls=NumpyEncoder))
-
         if self.model_format and post_write and not self.gp_is_mapped:
             self.gp.write_model(f"{self.output_name}_model", self.model_format)
 
+    def _open_pool(self):
+        """
+        Open a process pool to be reused by the parallel GP predictions,
+        if predictions are parallelized over atoms.
+        """
+        if self._pool is not None:
+            return
+        if self.gp_is_mapped or self.n_cpus == 1 or not self.gp.per_atom_par:
+            return
+        self._pool = mp.Pool(processes=self.n_cpus or mp.cpu_count())
+
+    def _close_pool(self):
+        """
+        Close the process pool opened by _open_pool.
+        """
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+    def _frame_predictor(self):
+        """
+        Resolve the prediction function of the current model once, so that
+        the frames of a run are predicted on without dispatching on the
+        model type every frame. Atoms which are skipped will have NaN as
+        their force / std values.
+
+        :return: Function of a frame and the indices of the atoms to predict
+            on, returning the forces, uncertainties, and local energies (None
+            if they are not computed)
+        """
+
+        # Three different predictions: Either MGP, GP with energy,
+        # or GP without
+        if self.gp_is_mapped:
+            return partial(
+                self.pred_func,
+                mgp=self.gp,
+                write_to_structure=False,
+                skipped_atom_value=np.nan,
+                energy=True,
+            )
+
+        predict = partial(
+            self.pred_func,
+            gp=self.gp,
+            n_cpus=self.n_cpus,
+            write_to_structure=False,
+            skipped_atom_value=np.nan,
+            pool=self._pool,
+        )
+        if self.calculate_energy:
+            return predict
+
+        def predict_forces(structure, selective_atoms):
+            return (*predict(structure, selective_atoms=selective_atoms), None)
+
+        return predict_forces
+
+    def _predict_batched(
+        self, frames: List[Structure], predict_atoms_per_elt: Dict[str, int] = None
+    ) -> List[Tuple["np.ndarray", "np.ndarray", Union["np.ndarray", None]]]:
+        """
+        Predict the forces, uncertainties and local energies of a batch of
+        frames, parallelizing over the atoms of all frames at once. The GP
+        model must not change in between the frames of a batch, so this is
+        not used for MGPs or frames which may be added to the training set.
+
+        :param frames: Structures to predict on
+        :param predict_atoms_per_elt: Number of atoms per element to predict
+            on, see subset_of_frame_by_element
+        :return: Forces, uncertainties, and local energies (None if they are
+            not computed) of each frame
+        """
+
+        predict_atoms = None
+        if predict_atoms_per_elt:
+            predict_atoms = [
+                subset_of_frame_by_element(frame, predict_atoms_per_elt)
+                for frame in frames
+            ]
+        predictions = predict_on_structures_par(
+            frames,
+            self.gp,
+            n_cpus=self.n_cpus,
+            selective_atoms=predict_atoms,
+            skipped_atom_value=np.nan,
+            energy=self.calculate_energy,
+            pool=self._pool,
+        )
+
+        if self.calculate_energy:
+            return predictions
+        return [(forces, stds, None) for forces, stds in predictions]
+
+    def _as_predict_dtype(self, *predictions):
+        """
+        Cast predicted arrays to predict_dtype, leaving None entries as is.
+        """
+        return tuple(
+            None if pred is None else np.asarray(pred, dtype=self.predict_dtype)
+            for pred in predictions
+        )
+
+    @property
+    def _training_statistics(self) -> dict:
+        """
+        Training statistics of the GP model, recomputed only when the model
+        or the size of its training set has changed since the last call.
+        MGP models store their statistics, so they are returned directly.
+        """
+        if self.gp_is_mapped:
+            return self.gp.training_statistics
+
+        cache = self._gp_stats_cache
+        if cache is None or cache[0] is not self.gp or cache[1] != len(self.gp):
+            stats = self.gp.training_statistics
+            self._gp_stats_cache = (self.gp, stats["N"], stats)
+        return self._gp_stats_cache[2]
+
+    @property
+    def _noise(self) -> float:
+        """
+        Noise hyperparameter of the GP, parsed from its hyps_mask only when the
+        hyperparameters change. Zero for mapped GPs.
+        """
+        if self.gp_is_mapped:
+            return 0
+        cache = self._noise_cache
+        if cache is None or cache[0] is not self.gp or cache[1] is not self.gp.hyps:
+            noise = Parameters.get_noise(
+                self.gp.hyps_mask, self.gp.hyps, constraint=False
+            )
+            self._noise_cache = (self.gp, self.gp.hyps, noise)
+        return self._noise_cache[2]
+
+    @property
+    def _training_statistics_json(self) -> str:
+        """
+        JSON string of the training statistics, serialized once for every
+        new set of statistics.
+        """
+        stats = self._training_statistics
+        cache = self._gp_stats_json_cache
+        if cache is None or cache[0] is not stats:
+            self._gp_stats_json_cache = (stats, json.dumps(stats))
+        return self._gp_stats_json_cache[1]
+
     def write_model_decision(
         self,
         write_model_train_interval: int,
@@ -613,7 +822,7 @@ class TrajectoryTrainer:
             structure=None,
             std_tolerance=(self.rel_std_tolerance, self.abs_std_tolerance),
             optional={
-                "GP Statistics": json.dumps(self.gp.training_statistics),
+                "GP Statistics": self._training_statistics_json,
                 "GP Name": self.gp.name,
                 "GP Write Name": self.output_name + "_model." + self.model_format,
             },
@@ -627,8 +836,9 @@ class TrajectoryTrainer:
         logger.debug("Now beginning pre-run activity.")
         # If seed environments were passed in, add them to the GP.
 
-        for point in self.seed_envs:
-            self.gp.add_one_env(point[0], point[1], train=False)
+        if self.seed_envs:
+            seed_envs, seed_forces = zip(*self.seed_envs)
+            self.gp.add_envs(list(seed_envs), list(seed_forces), train=False)
 
         # No training set ("blank slate" run) and no seeds specified:
         # Take one of each atom species in the first frame
@@ -654,11 +864,10 @@ class TrajectoryTrainer:
         atom_count = 0
         for frame in self.seed_frames:
             train_atoms = []
-            for species_i in set(frame.coded_species):
+            for species_i, atoms_of_specie in indices_by_species(frame).items():
                 # Get a randomized set of atoms of species i from the frame
                 # So that it is not always the lowest-indexed atoms chosen
-                atoms_of_specie = frame.indices_of_specie(species_i)
-                np.random.shuffle(atoms_of_specie)
+                self.rng.shuffle(atoms_of_specie)
                 n_at = len(atoms_of_specie)
                 # Determine how many to add based on user defined cutoffs
                 n_to_add = min(
@@ -667,9 +876,9 @@ class TrajectoryTrainer:
                     self.max_atoms_from_frame,
                 )
 
-                for atom in atoms_of_specie[:n_to_add]:
-                    train_atoms.append(atom)
-                    atom_count += 1
+                added_atoms = atoms_of_specie[:n_to_add].tolist()
+                train_atoms += added_atoms
+                atom_count += len(added_atoms)
 
             self.update_gp_and_print(
                 frame=frame,
@@ -679,12 +888,12 @@ class TrajectoryTrainer:
             )
 
         logger = logging.getLogger(self.logger_name)
-        if atom_count > 0:
+        if atom_count > 0 and logger.isEnabledFor(logging.INFO):
             logger.info(
                 f"Added {atom_count} atoms to "
                 "pretrain.\n"
                 "Pre-run GP Statistics: "
-                f"{json.dumps(self.gp.training_statistics)} "
+                f"{self._training_statistics_json} "
             )
 
         if (self.seed_envs or atom_count or self.seed_frames) and (
@@ -708,7 +917,7 @@ class TrajectoryTrainer:
         if self.model_format and not self.gp_is_mapped:
             self.gp.write_model(f"{self.output_name}_prerun", self.model_format)
 
-    def run(self):
+    def run(self, predict_batch_size: int = 8):
         """
         UPDATE: SOON TO BE DEPRECATED, CIRCA SEPTEMBER 2020
 
@@ -717,6 +926,12 @@ class TrajectoryTrainer:
         the training set upon the triggering of the uncertainty or force error
         threshold.
 
+        :param predict_batch_size: Maximum number of frames predicted on
+            together, parallelizing over the atoms of all of them at once.
+            Frames before the validation frames are predicted on ahead of
+            time, and their predictions are discarded if the GP is updated
+            in between; the batches of those frames start from a single frame
+            after each update and grow while the GP stays unchanged.
         :return: None
         """
 
@@ -726,195 +941,182 @@ class TrajectoryTrainer:
         if not self.gp_is_mapped:
             self.pre_run()
 
+        frames = self.frames[:: self.skip]
+
         # Past this frame, stop adding atoms to the training set
         #  (used for validation of model)
-        train_frame = int(len(self.frames[:: self.skip]) * (1 - self.validate_ratio))
+        train_frame = int(len(frames) * (1 - self.validate_ratio))
 
         # Loop through trajectory.
         cur_atoms_added_train = 0  # Track atoms added for training
         cur_atoms_added_write = 0  # Track atoms added for writing
         cur_trains_done_write = 0  # Track training done for writing
 
-        # Keep track of which atoms trigger force / uncertainty condition
-        training_plan = {}
-
-        for i, cur_frame in enumerate(self.frames[:: self.skip]):
-
-            frame_start_time = time.time()
-            logger.info(f"=====NOW ON FRAME {i}=====")
+        # Keep track of which atoms trigger force / uncertainty condition,
+        # written frame by frame as they are found
+        training_plan = None
+        if self.print_training_plan:
+            training_plan = _TrainingPlanWriter(
+                f"{self.output_name}_training_plan.json"
+            )
 
-            # If no predict_atoms_per_element was specified, predict_atoms
-            # will be equal to every atom in the frame.
-            predict_atoms = subset_of_frame_by_element(
-                cur_frame, self.predict_atoms_per_element
+        try:
+            # Keep one process pool for the parallel predictions of the whole run
+            self._open_pool()
+            predictions = _AheadPredictions(
+                self,
+                frames,
+                train_frame,
+                predict_batch_size,
+                self.predict_atoms_per_element,
             )
 
-            # Atoms which are skipped will have NaN as their force / std values
-            local_energies = None
-
-            # Three different predictions: Either MGP, GP with energy,
-            # or GP without
-            if self.gp_is_mapped:
-                pred_forces, pred_stds, local_energies = self.pred_func(
-                    structure=cur_frame,
-                    mgp=self.gp,
-                    write_to_structure=False,
-                    selective_atoms=predict_atoms,
-                    skipped_atom_value=np.nan,
-                    energy=True,
-                )
-            elif self.calculate_energy:
-                pred_forces, pred_stds, local_energies = self.pred_func(
-                    structure=cur_frame,
-                    gp=self.gp,
-                    n_cpus=self.n_cpus,
-                    write_to_structure=False,
-                    selective_atoms=predict_atoms,
-                    skipped_atom_value=np.nan,
-                )
-            else:
-                pred_forces, pred_stds = self.pred_func(
-                    structure=cur_frame,
-                    gp=self.gp,
-                    n_cpus=self.n_cpus,
-                    write_to_structure=False,
-                    selective_atoms=predict_atoms,
-                    skipped_atom_value=np.nan,
-                )
+            for i, cur_frame in enumerate(frames):
 
-            # Get Error
-            dft_forces = cur_frame.forces
-            dft_energy = cur_frame.energy
-            error = np.abs(pred_forces - dft_forces)
-
-            # Create dummy frame with the predicted forces written
-            dummy_frame = deepcopy(cur_frame)
-            dummy_frame.forces = pred_forces
-            dummy_frame.stds = pred_stds
-            cur_frame.stds = pred_stds
-
-            self.output.write_gp_dft_comparison(
-                curr_step=i,
-                frame=dummy_frame,
-                start_time=frame_start_time,
-                dft_forces=dft_forces,
-                dft_energy=dft_energy,
-                error=error,
-                local_energies=local_energies,
-                KE=0,
-                cell=cur_frame.cell,
-            )
+                frame_start_time = time.time()
+                logger.info(f"=====NOW ON FRAME {i}=====")
 
-            logger.debug(
-                f"Single frame calculation time {time.time()-frame_start_time}"
-            )
+                pred_forces, pred_stds, local_energies = predictions.predict(i)
+                pred_forces, pred_stds, local_energies = self._as_predict_dtype(
+                    pred_forces, pred_stds, local_energies
+                )
 
-            if i < train_frame:
-                # Noise hyperparameter & relative std tolerance is not for gp_is_mapped.
-                if self.gp_is_mapped:
-                    noise = 0
-                else:
-                    noise = Parameters.get_noise(
-                        self.gp.hyps_mask, self.gp.hyps, constraint=False
+                # Get Error
+                dft_forces = cur_frame.forces
+                dft_energy = cur_frame.energy
+                # Select atoms with the float64 errors; only the reported
+                # errors are cast to error_dtype
+                error, max_error_by_atom = force_errors(pred_forces, dft_forces)
+                error = error.astype(self.error_dtype, copy=False)
+
+                # Write the predicted forces to the frame for output, and
+                # restore the DFT forces afterwards
+                cur_frame.forces = pred_forces
+                cur_frame.stds = pred_stds
+                try:
+                    self.output.write_gp_dft_comparison(
+                        curr_step=i,
+                        frame=cur_frame,
+                        start_time=frame_start_time,
+                        dft_forces=dft_forces,
+                        dft_energy=dft_energy,
+                        error=error,
+                        local_energies=local_energies,
+                        KE=0,
+                        cell=cur_frame.cell,
                     )
-                std_in_bound, std_train_atoms = is_std_in_bound_per_species(
-                    rel_std_tolerance=self.rel_std_tolerance,
-                    abs_std_tolerance=self.abs_std_tolerance,
-                    noise=noise,
-                    structure=dummy_frame,
-                    max_atoms_added=self.max_atoms_from_frame,
-                    max_by_species=self.train_env_per_species,
-                )
+                finally:
+                    cur_frame.forces = dft_forces
 
-                # Get max force error atoms
-                force_in_bound, force_train_atoms = is_force_in_bound_per_species(
-                    abs_force_tolerance=self.abs_force_tolerance,
-                    predicted_forces=pred_forces,
-                    label_forces=dft_forces,
-                    structure=dummy_frame,
-                    max_atoms_added=self.max_atoms_from_frame,
-                    max_by_species=self.train_env_per_species,
-                    max_force_error=self.max_force_error,
+                logger.debug(
+                    f"Single frame calculation time {time.time()-frame_start_time}"
                 )
 
-                if not std_in_bound or not force_in_bound:
-
-                    # -1 is returned from the is_in_bound methods,
-                    # so filter that out and the use sets to remove repeats
-                    train_atoms = list(
-                        set(std_train_atoms).union(force_train_atoms) - {-1}
+                if i < train_frame:
+                    # Noise hyperparameter & relative std tolerance is not for
+                    # gp_is_mapped.
+                    noise = self._noise
+                    std_in_bound, std_train_atoms = is_std_in_bound_per_species(
+                        rel_std_tolerance=self.rel_std_tolerance,
+                        abs_std_tolerance=self.abs_std_tolerance,
+                        noise=noise,
+                        structure=cur_frame,
+                        max_atoms_added=self.max_atoms_from_frame,
+                        max_by_species=self.train_env_per_species,
                     )
 
-                    # Record frame and training atoms, uncertainty, error
-                    force_errors = list(np.abs(pred_forces - dft_forces))
-                    uncertainties = list(dummy_frame.stds)
-                    training_plan[int(i)] = [
-                        (int(a), uncertainties[a], force_errors[a]) for a in train_atoms
-                    ]
-
-                    # Compute mae and write to output;
-                    # Add max uncertainty atoms to training set
-                    self.update_gp_and_print(
-                        cur_frame,
-                        train_atoms=train_atoms,
-                        uncertainties=pred_stds[train_atoms],
-                        train=False,
+                    # Get max force error atoms
+                    force_in_bound, force_train_atoms = is_force_in_bound_per_species(
+                        abs_force_tolerance=self.abs_force_tolerance,
+                        predicted_forces=pred_forces,
+                        label_forces=dft_forces,
+                        structure=cur_frame,
+                        max_atoms_added=self.max_atoms_from_frame,
+                        max_by_species=self.train_env_per_species,
+                        max_force_error=self.max_force_error,
+                        max_error_components=max_error_by_atom,
                     )
-                    cur_atoms_added_train += len(train_atoms)
-                    cur_atoms_added_write += len(train_atoms)
-                    # Re-train if number of sampled atoms is high enough
-
-                    if (
-                        cur_atoms_added_train >= self.min_atoms_per_train
-                        or (i + 1) == train_frame
-                    ):
-                        if self.train_count < self.max_trains:
-                            self.train_gp()
-                            cur_trains_done_write += 1
+
+                    if not std_in_bound or not force_in_bound:
+
+                        # -1 is returned from the is_in_bound methods,
+                        # so filter that out after merging without repeats
+                        train_atoms = np.union1d(std_train_atoms, force_train_atoms)
+                        train_atoms = train_atoms[train_atoms != -1]
+                        train_atoms = train_atoms.astype(int).tolist()
+
+                        # Record frame and training atoms, uncertainty, error
+                        train_idx = np.asarray(train_atoms, dtype=np.intp)
+                        train_stds = pred_stds[train_idx]
+                        if training_plan is not None:
+                            training_plan.write(
+                                i, train_idx, train_stds, error[train_idx]
+                            )
+
+                        # Compute mae and write to output;
+                        # Add max uncertainty atoms to training set
+                        self.update_gp_and_print(
+                            cur_frame,
+                            train_atoms=train_atoms,
+                            uncertainties=train_stds,
+                            train=False,
+                        )
+                        # Predictions made ahead of time are out of date now
+                        predictions.discard()
+                        cur_atoms_added_train += len(train_atoms)
+                        cur_atoms_added_write += len(train_atoms)
+                        # Re-train if number of sampled atoms is high enough
+
+                        if (
+                            cur_atoms_added_train >= self.min_atoms_per_train
+                            or (i + 1) == train_frame
+                        ):
+                            if self.train_count < self.max_trains:
+                                self.train_gp()
+                                cur_trains_done_write += 1
+                            else:
+                                self.gp.update_L_alpha()
+                            cur_atoms_added_train = 0
                         else:
                             self.gp.update_L_alpha()
-                        cur_atoms_added_train = 0
-                    else:
-                        self.gp.update_L_alpha()
-
-                    # Loop to decide of a model should be written this
-                    # iteration
-                    will_write = False
-
-                    if (
-                        self.train_checkpoint_interval
-                        and cur_trains_done_write
-                        and self.train_checkpoint_interval <= cur_trains_done_write
-                    ):
-                        will_write = True
-                        cur_trains_done_write = 0
-
-                    if (
-                        self.atom_checkpoint_interval
-                        and cur_atoms_added_write
-                        and self.atom_checkpoint_interval <= cur_atoms_added_write
-                    ):
-                        will_write = True
-                        cur_atoms_added_write = 0
-
-                    if self.model_format and will_write:
-                        self.gp.write_model(
-                            f"{self.output_name}_checkpt", self.model_format
-                        )
 
-                if (i + 1) == train_frame and not self.gp_is_mapped:
-                    self.gp.check_L_alpha()
+                        # Loop to decide of a model should be written this
+                        # iteration
+                        will_write = False
+
+                        if (
+                            self.train_checkpoint_interval
+                            and cur_trains_done_write
+                            and self.train_checkpoint_interval <= cur_trains_done_write
+                        ):
+                            will_write = True
+                            cur_trains_done_write = 0
+
+                        if (
+                            self.atom_checkpoint_interval
+                            and cur_atoms_added_write
+                            and self.atom_checkpoint_interval <= cur_atoms_added_write
+                        ):
+                            will_write = True
+                            cur_atoms_added_write = 0
+
+                        if self.model_format and will_write:
+                            self.gp.write_model(
+                                f"{self.output_name}_checkpt", self.model_format
+                            )
+
+                    if (i + 1) == train_frame and not self.gp_is_mapped:
+                        self.gp.check_L_alpha()
+
+        finally:
+            self._close_pool()
+            if training_plan is not None:
+                training_plan.close()
 
         # Print training statistics for GP model used
-        conclusion_strings = [
-            "Final GP statistics:" + json.dumps(self.gp.training_statistics)
-        ]
+        conclusion_strings = ["Final GP statistics:" + self._training_statistics_json]
         self.output.conclude_run(conclusion_strings)
 
-        if self.print_training_plan:
-            with open(f"{self.output_name}_training_plan.json", "w") as f:
-                f.write(json.dumps(training_plan, cls=NumpyEncoder))
-
         if self.model_format and not self.gp_is_mapped:
             self.gp.write_model(f"{self.output_name}_model", self.model_format)
 
@@ -940,26 +1142,28 @@ class TrajectoryTrainer:
             return
 
         # Group added atoms by species for easier output
-        added_species = [Z_to_element(frame.coded_species[at]) for at in train_atoms]
-        added_atoms = {spec: [] for spec in set(added_species)}
-
-        for atom, spec in zip(train_atoms, added_species):
-            added_atoms[spec].append(atom)
+        added_atoms = defaultdict(list)
+        for atom in train_atoms:
+            Z = frame.coded_species[atom]
+            if Z not in self._element_names:
+                self._element_names[Z] = Z_to_element(Z)
+            added_atoms[self._element_names[Z]].append(atom)
 
         logger = logging.getLogger(self.logger_name)
-        logger.info(
-            "Adding atom(s) "
-            f"{json.dumps(added_atoms,cls=NumpyEncoder)}"
-            " to the training set."
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Adding atom(s) "
+                f"{numpy_dumps(added_atoms)}"
+                " to the training set."
+            )
 
-        if uncertainties is None:
-            uncertainties = frame.stds[train_atoms]
+            if uncertainties is None:
+                uncertainties = frame.stds[train_atoms]
 
-        if uncertainties is not None and len(uncertainties) != 0:
-            logger.info(f"Uncertainties: {uncertainties}.")
+            if uncertainties is not None and len(uncertainties) != 0:
+                logger.info(f"Uncertainties: {uncertainties}.")
 
-        logger.info(f"New GP Statistics: {json.dumps(self.gp.training_statistics)}\n")
+            logger.info(f"New GP Statistics: {self._training_statistics_json}\n")
 
         # update gp model; handling differently if it's an MGP
         if not self.gp_is_mapped:
@@ -1005,6 +1209,7 @@ class TrajectoryTrainer:
             self.gp.maxiter = temp_maxiter
         else:
             self.gp.train(logger_name=logger_train)
+        self._noise_cache = None
 
         hyps, labels = Parameters.get_hyps(
             self.gp.hyps_mask, self.gp.hyps, constraint=False, label=True
@@ -1022,62 +1227,241 @@ class TrajectoryTrainer:
         self.train_count += 1
 
 
-def parse_frame_block(chunk: str, compute_errors: bool = True):
-    # i loops through individual atom's info
+class _AheadPredictions:
+    """
+    Predictions on the frames of a run, made ahead of time in batches which
+    parallelize over the atoms of several frames at once. Frames from
+    train_frame on do not change the GP model, so they are predicted on in
+    batches of batch_size. Frames before it may update the GP, so their
+    batches start from a single frame after each update, when the
+    predictions made ahead of time are discarded, and double in size while
+    the GP stays unchanged. MGPs, and batch sizes of 1, predict on one frame
+    at a time.
+    """
 
-    frame_atoms = []
-    frame_positions = []
-    gp_forces = []
-    dft_forces = []
-    stds = []
-    added_atoms = {}
-    frame_species_maes = {}
+    def __init__(
+        self,
+        trainer: TrajectoryTrainer,
+        frames: List[Structure],
+        train_frame: int,
+        batch_size: int,
+        predict_atoms_per_elt: Dict[str, int] = None,
+    ):
+        self._trainer = trainer
+        self._frames = frames
+        self._train_frame = train_frame
+        self._batch_size = batch_size if not trainer.gp_is_mapped else 1
+        self._predict_atoms_per_elt = predict_atoms_per_elt
+        self._predict_frame = trainer._frame_predictor()
+        self._predictions = {}
+        self._train_batch_size = 1
+
+    def predict(self, i: int):
+        """
+        Forces, uncertainties and local energies (None if they are not
+        computed) of frame i, predicted with the current GP model.
+        """
+        if i in self._predictions:
+            return self._predictions.pop(i)
 
-    # First two lines contain frame # and header
-    for i in range(2, len(chunk)):
+        if self._batch_size > 1 and (
+            i >= self._train_frame or self._train_batch_size > 1
+        ):
+            # Training frames are batched up to train_frame, as the
+            # model is checked there before the validation frames
+            if i < self._train_frame:
+                end = min(i + self._train_batch_size, self._train_frame)
+                self._train_batch_size = min(
+                    2 * self._train_batch_size, self._batch_size
+                )
+            else:
+                end = min(i + self._batch_size, len(self._frames))
+            batch = range(i, end)
+            self._predictions = dict(
+                zip(
+                    batch,
+                    self._trainer._predict_batched(
+                        [self._frames[j] for j in batch], self._predict_atoms_per_elt
+                    ),
+                )
+            )
+            return self._predictions.pop(i)
 
-        # Lines with data will be long; stop when at end of atom data
-        # Terminate at blank line between results
-        if chunk[i] != "\n":
-            split = chunk[i].split()
+        # If no predict_atoms_per_element was specified, predict on
+        # every atom in the frame.
+        frame = self._frames[i]
+        predict_atoms = None
+        if self._predict_atoms_per_elt:
+            predict_atoms = subset_of_frame_by_element(
+                frame, self._predict_atoms_per_elt
+            )
+        if i < self._train_frame:
+            self._train_batch_size = min(2, self._batch_size)
+        return self._predict_frame(frame, selective_atoms=predict_atoms)
 
-            frame_atoms.append(split[0])
+    def discard(self):
+        """
+        Discard the predictions made ahead of time, after the GP is updated.
+        """
+        self._predictions = {}
+        self._train_batch_size = 1
 
-            frame_positions.append([float(split[1]), float(split[2]), float(split[3])])
-            gp_forces.append([float(split[4]), float(split[5]), float(split[6])])
-            stds.append([float(split[7]), float(split[8]), float(split[9])])
 
-            dft_forces.append([float(split[10]), float(split[11]), float(split[12])])
-        else:
-            break
+class _TrainingPlanWriter:
+    """
+    Write a training plan to a JSON file one frame at a time, in the same
+    {frame: [[atom, uncertainties, errors], ...]} format as dumping the whole
+    plan at the end of a run. The file is valid JSON once it is closed.
+    """
+
+    def __init__(self, filename: str):
+        self._file = open(filename, "w")
+        self._file.write("{")
+        self._separator = ""
 
-    # Loop through information in frame after Data
+    def write(self, frame: int, atoms, uncertainties, errors):
+        """
+        Write the training atoms of a frame, with their uncertainties and
+        force errors.
+        """
+        entries = numpy_dumps(
+            list(zip(np.asarray(atoms).tolist(), uncertainties, errors))
+        )
+        self._file.write(f'{self._separator}"{int(frame)}": {entries}')
+        self._separator = ", "
+
+    def close(self):
+        self._file.write("}")
+        self._file.close()
+
+
+_MAX_COUNT = np.iinfo(np.int64).max
+
+
+def _to_count(value) -> int:
+    """
+    Clip a (possibly infinite) atom count to a value which fits in an int64.
+    """
+    return int(max(min(value, _MAX_COUNT), -_MAX_COUNT))
+
+
+def _counts_by_Z(counts: dict, n_Z: int, default) -> "np.ndarray":
+    """
+    Gather atom counts keyed by element or atomic number into an int64 array
+    indexed by atomic number.
+
+    :param counts: Dictionary of atom counts by element or atomic number
+    :param n_Z: Length of the array, larger than any atomic number used
+    :param default: Count of the elements absent from the dictionary
+    :return: Array of the counts by atomic number
+    """
+    counts_by_Z = np.full(n_Z, _to_count(default), dtype=np.int64)
+    for key, val in counts.items():
+        Z = element_to_Z(key)
+        if Z < n_Z:
+            counts_by_Z[Z] = _to_count(val)
+    return counts_by_Z
+
+
+@njit
+def _plan_species_counts(
+    species_counts,
+    cap_per_frame,
+    cap_model_remaining,
+    max_atoms_per_frame,
+    available_to_add,
+):
+    """
+    Determine how many atoms of each species to add from a frame, given the
+    number of atoms of each species present and the per-frame and per-model
+    caps of each species.
+
+    :param species_counts: Number of atoms of each species in the frame
+    :param cap_per_frame: Max # of atoms of each species to add per frame
+    :param cap_model_remaining: Remaining # of atoms of each species which
+        can be added before the model limit is reached
+    :param max_atoms_per_frame: Max # of atoms to add from the frame
+    :param available_to_add: Remaining # of atoms before the model is full
+    :return: Array of the number of atoms to add for each species
+    """
+
+    n_species = len(species_counts)
+    n_add_by_species = np.zeros(n_species, dtype=np.int64)
+    n_picked = 0
+
+    for i in range(n_species):
+        n_add = min(
+            species_counts[i],
+            cap_per_frame[i],
+            max_atoms_per_frame - n_picked,
+            available_to_add - n_picked,
+            cap_model_remaining[i],
+        )
+        n_add = max(0, n_add)
+
+        n_add_by_species[i] = n_add
+        n_picked += n_add
+        available_to_add -= n_add
+
+    return n_add_by_species
+
+
+def parse_frame_block(chunk: str, compute_errors: bool = True):
+
+    added_atoms = {}
+    frame_species_maes = {}
+
+    # First two lines contain frame # and header; the atom data is
+    # terminated at blank line between results
+    data_end = len(chunk)
+    for i in range(2, len(chunk)):
+        if chunk[i] == "\n":
+            data_end = i
+            break
+    data_lines = chunk[2:data_end]
+
+    # Parse the table of atom data into one preallocated array; columns are
+    # species, positions, GP forces, stds and DFT forces. The tables hold no
+    # comments, so skip looking for them.
+    frame_atoms = [line.split(maxsplit=1)[0] for line in data_lines]
+    if data_lines:
+        data = np.loadtxt(data_lines, usecols=range(1, 13), ndmin=2, comments=None)
+    else:
+        data = np.empty((0, 12))
+    frame_positions = data[:, 0:3]
+    gp_forces = data[:, 3:6]
+    stds = data[:, 6:9]
+    dft_forces = data[:, 9:12]
+
+    # Loop through information in frame after Data; each kind of line is
+    # identified by how it starts
     cell = None
-    for i in range(len(frame_positions) + 2, len(chunk)):
-        if "cell" in chunk[i]:
-            split_line = chunk[i].strip().split(":")
+    for i in range(data_end, len(chunk)):
+        line = chunk[i]
+        if line.startswith("type "):
+            cur_line = line.split()
+            frame_species_maes[cur_line[1]] = float(cur_line[3])
+
+        elif line.startswith("cell"):
+            split_line = line.strip().split(":")
             cell = np.array(json.loads(split_line[1]))
 
-        if "Adding atom(s)" in chunk[i]:
+        elif line.startswith("Adding atom(s)"):
             # Splitting to target the 'added atoms' substring
-            split_line = chunk[i][15:-21]
+            split_line = line[15:-21]
             added_atoms = json.loads(split_line.strip())
 
-        if "type " in chunk[i]:
-            cur_line = chunk[i].split()
-            frame_species_maes[cur_line[1]] = float(cur_line[3])
-
     cur_frame_stats = {
         "species": frame_atoms,
-        "positions": np.array(frame_positions),
-        "gp_forces": np.array(gp_forces),
-        "dft_forces": np.array(dft_forces),
-        "gp_stds": np.array(stds),
+        "positions": frame_positions,
+        "gp_forces": gp_forces,
+        "dft_forces": dft_forces,
+        "gp_stds": stds,
         "added_atoms": added_atoms,
         "maes_by_species": frame_species_maes,
     }
     if compute_errors:
-        cur_frame_stats["force_errors"] = np.array(gp_forces) - np.array(dft_forces)
+        cur_frame_stats["force_errors"] = gp_forces - dft_forces
     if cell is not None:
         cur_frame_stats["cell"] = cell
 
@@ -1100,26 +1484,9 @@ def parse_trajectory_trainer_output(
         'maes_by_species', optionally, gp_data dictionary
     """
 
+    header = {} if return_gp_data else None
     with open(file, "r") as f:
-        lines = f.readlines()
-        num_lines = len(lines)
-
-    # Get indexes where frames begin, and include the index of the final line
-    frame_indexes = [i for i in range(num_lines) if "-Frame:" in lines[i]] + [num_lines]
-
-    frames = []
-
-    # Central parsing loop
-    for n in range(len(frame_indexes) - 1):
-        # Start at +2 to skip frame marker and header of table of data
-        # Set up values for current frame which will be populated
-
-        range(frame_indexes[n] + 2, frame_indexes[n + 1])
-
-        near_index = frame_indexes[n]
-        far_index = frame_indexes[n + 1]
-
-        frames.append(parse_frame_block(lines[near_index:far_index]))
+        frames = list(_iterate_frame_blocks(f, compute_errors, header))
 
     if not return_gp_data:
         return frames
@@ -1127,17 +1494,13 @@ def parse_trajectory_trainer_output(
     # Compute information about GP training
     # to study GP growth and performance over trajectory
 
-    gp_stats_line = [
-        line for line in lines[:35] if "GP Statistics" in line and "Pre-run" not in line
-    ][0][15:].strip()
-
-    initial_gp_statistics = json.loads(gp_stats_line)
+    initial_gp_statistics = json.loads(header["init_stats"])
 
     # Get pre_run statistics (if pre-run was done):
     pre_run_gp_statistics = None
-    pre_run_gp_stats_line = [line for line in lines if "Pre-run GP" in line]
+    pre_run_gp_stats_line = header.get("pre_train_stats")
     if pre_run_gp_stats_line:
-        pre_run_gp_statistics = json.loads(pre_run_gp_stats_line[0][22:].strip())
+        pre_run_gp_statistics = json.loads(pre_run_gp_stats_line)
 
     # Compute cumulative GP size
     cumulative_gp_size = [int(initial_gp_statistics["N"])]
@@ -1177,6 +1540,48 @@ def parse_trajectory_trainer_output(
     return frames, gp_data
 
 
+def iterate_trajectory_trainer_output(
+    file: str, compute_errors: bool = True
+) -> Iterator[dict]:
+    """
+    Lazily read the output of a TrajectoryTrainer run frame by frame,
+    holding only the lines of one frame at a time.
+
+    :param file: filename of output
+    :param compute_errors: Compute deviation from GP and DFT forces.
+    :return: Iterator over the frame dictionaries returned by
+        parse_trajectory_trainer_output
+    """
+    with open(file, "r") as f:
+        yield from _iterate_frame_blocks(f, compute_errors)
+
+
+def _iterate_frame_blocks(
+    lines: Iterable[str], compute_errors: bool = True, header: dict = None
+) -> Iterator[dict]:
+    """
+    Parse each frame block of a TrajectoryTrainer output in a single pass
+    over its lines. If a header dictionary is passed, it is filled with the
+    initial and pre-run GP statistics strings found before the first frame.
+    """
+    block = None
+    for line in lines:
+        if "-Frame:" in line:
+            if block is not None:
+                yield parse_frame_block(block, compute_errors)
+            block = [line]
+        elif block is not None:
+            block.append(line)
+        elif header is not None:
+            if line.startswith("GP Statistics"):
+                header.setdefault("init_stats", line[15:].strip())
+            elif line.startswith("Pre-run GP"):
+                header.setdefault("pre_train_stats", line[22:].strip())
+
+    if block is not None:
+        yield parse_frame_block(block, compute_errors)
+
+
 def structures_from_gpfa_output(frame_dictionaries: List[dict]) -> List[Structure]:
     """
     Takes as input the first output from the `parse_trajectory_trainer_output`
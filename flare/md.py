@@ -3,16 +3,21 @@ from typing import List
 import numpy as np
 
 
+def atom_masses(structure):
+    """Per-atom masses of a structure, looked up from its mass dictionary."""
+    mass_dict = structure.mass_dict
+    return np.array([mass_dict[label] for label in structure.species_labels])
+
+
 def update_positions(dt, noa, structure):
     dtdt = dt ** 2
-    new_pos = np.zeros((noa, 3))
-
-    for i, pre_pos in enumerate(structure.prev_positions):
-        mass = structure.mass_dict[structure.species_labels[i]]
-        pos = structure.positions[i]
-        forces = structure.forces[i]
+    masses = atom_masses(structure)[:, None]
 
-        new_pos[i] = 2 * pos - pre_pos + dtdt * forces / mass
+    new_pos = (
+        2 * structure.positions
+        - structure.prev_positions
+        + dtdt * structure.forces / masses
+    )
 
     # Update previous and current positions.
     structure.prev_positions = np.copy(structure.positions)
@@ -23,15 +28,8 @@ def calculate_temperature(structure, dt, noa):
     # Set velocity and temperature information.
     velocities = (structure.positions - structure.prev_positions) / dt
 
-    KE = 0
-    for i in range(len(structure.positions)):
-        for j in range(3):
-            KE += (
-                0.5
-                * structure.mass_dict[structure.species_labels[i]]
-                * velocities[i][j]
-                * velocities[i][j]
-            )
+    masses = atom_masses(structure)
+    KE = 0.5 * np.sum(masses[:, None] * velocities * velocities)
 
     # see conversions.nb for derivation
     kb = 0.0000861733034
@@ -15,7 +15,14 @@ from flare import struc, gp, env, md
 from flare.dft_interface import dft_software
 from flare.output import Output
 from flare.utils.learner import is_std_in_bound
-from flare.utils.element_coder import NumpyEncoder
+from flare.utils.element_coder import numpy_dumps
+
+
+def _copy_stress(stress):
+    """Copy a stress array, leaving an unset (None) stress unchanged."""
+    if stress is None:
+        return None
+    return np.array(stress, copy=True)
 
 
 class OTF:
@@ -94,6 +101,11 @@ class OTF:
 
         n_cpus (int, optional): Number of cpus used during training.
             Defaults to 1.
+        output_flush_every (int, optional): Number of MD steps between
+            flushes of the output log. If greater than 1, log records are
+            buffered in memory and also written out before each DFT call,
+            checkpoint and at the end of the run. Defaults to 1, which
+            writes every record immediately.
     """
 
     def __init__(
@@ -131,9 +143,15 @@ class OTF:
         store_dft_output: Tuple[Union[str, List[str]], str] = None,
         # other args
         n_cpus: int = 1,
+        output_flush_every: int = 1,
         **kwargs,
     ):
 
+        if output_flush_every < 1:
+            raise ValueError(
+                f"output_flush_every must be at least 1, got {output_flush_every}"
+            )
+
         # set DFT
         self.dft_loc = dft_loc
         self.dft_input = dft_input
@@ -151,6 +169,7 @@ class OTF:
         self.get_structure_from_input(prev_pos_init)  # parse input file
         self.noa = self.structure.positions.shape[0]
         self.rescale_steps = rescale_steps
+        self._rescale_steps_set = frozenset(rescale_steps)
         self.rescale_temps = rescale_temps
 
         # set flare
@@ -168,7 +187,7 @@ class OTF:
         self.max_atoms_added = max_atoms_added
         self.freeze_hyps = freeze_hyps
         if init_atoms is None:  # set atom list for initial dft run
-            self.init_atoms = [int(n) for n in range(self.noa)]
+            self.init_atoms = list(range(self.noa))
         else:
             self.init_atoms = init_atoms
         self.update_style = update_style
@@ -207,7 +226,13 @@ class OTF:
             self.pred_func = predict.predict_on_structure_efs
 
         # set logger
-        self.output = Output(output_name, always_flush=True)
+        self.output_flush_every = output_flush_every
+        self.output = Output(
+            output_name,
+            always_flush=output_flush_every == 1,
+            buffered=output_flush_every > 1,
+        )
+        self._log = logging.getLogger(self.output.basename + "log")
         self.output_name = output_name
         self.gp_name = self.output_name + "_gp.json"
         self.checkpt_name = self.output_name + "_checkpt.json"
@@ -271,14 +296,14 @@ class OTF:
                     # record GP forces
                     self.update_temperature()
                     self.record_state()
-                    gp_frcs = deepcopy(self.structure.forces)
+                    gp_frcs = np.array(self.structure.forces, copy=True)
 
                     # run DFT and record forces
                     self.dft_step = True
                     self.steps_since_dft = 0
                     self.run_dft()
-                    dft_frcs = deepcopy(self.structure.forces)
-                    dft_stress = deepcopy(self.structure.stress)
+                    dft_frcs = np.array(self.structure.forces, copy=True)
+                    dft_stress = _copy_stress(self.structure.stress)
                     dft_energy = self.structure.potential_energy
 
                     # run MD step & record the state
@@ -295,11 +320,20 @@ class OTF:
                         dft_energy=dft_energy,
                     )
 
-            # write gp forces
+            # write gp forces; the temperature is only needed on the other
+            # steps if the velocities are rescaled after this one
             if counter >= self.skip and not self.dft_step:
                 self.update_temperature()
                 self.record_state()
                 counter = 0
+            elif not self.dft_step and self.curr_step in self._rescale_steps_set:
+                self.update_temperature()
+
+            if (
+                self.output_flush_every > 1
+                and self.curr_step % self.output_flush_every == 0
+            ):
+                self.output.flush()
 
             counter += 1
             # TODO: Reinstate velocity rescaling.
@@ -335,8 +369,8 @@ class OTF:
     def initialize_train(self):
         # call dft and update positions
         self.run_dft()
-        dft_frcs = deepcopy(self.structure.forces)
-        dft_stress = deepcopy(self.structure.stress)
+        dft_frcs = np.array(self.structure.forces, copy=True)
+        dft_stress = _copy_stress(self.structure.stress)
         dft_energy = self.structure.potential_energy
 
         self.update_temperature()
@@ -372,8 +406,9 @@ class OTF:
 
         Calculates DFT forces on atoms in the current structure."""
 
-        f = logging.getLogger(self.output.basename + "log")
+        f = self._log
         f.info("\nCalling DFT...\n")
+        self.output.flush()
 
         # calculate DFT forces
         # TODO: Return stress and energy
@@ -468,10 +503,11 @@ class OTF:
         )
 
     def compute_mae(self, gp_frcs, dft_frcs):
-        mae = np.mean(np.abs(gp_frcs - dft_frcs))
-        mac = np.mean(np.abs(dft_frcs))
+        err = np.subtract(gp_frcs, dft_frcs)
+        mae = np.abs(err, out=err).mean()
+        mac = np.abs(dft_frcs, out=err).mean()
 
-        f = logging.getLogger(self.output.basename + "log")
+        f = self._log
         f.info(f"mean absolute error: {mae:.4f} eV/A")
         f.info(f"mean absolute dft component: {mac:.4f} eV/A")
 
@@ -481,12 +517,12 @@ class OTF:
         Args:
             new_pos (np.ndarray): Positions of atoms in the next MD frame.
         """
-        if self.curr_step in self.rescale_steps:
+        if self.curr_step in self._rescale_steps_set:
             rescale_ind = self.rescale_steps.index(self.curr_step)
             temp_fac = self.rescale_temps[rescale_ind] / self.temperature
             vel_fac = np.sqrt(temp_fac)
-            self.structure.prev_positions = (
-                new_pos - self.velocities * self.dt * vel_fac
+            self.structure.prev_positions = new_pos - self.velocities * (
+                self.dt * vel_fac
             )
 
     def update_temperature(self):
@@ -515,16 +551,25 @@ class OTF:
         )
 
     def as_dict(self):
-        self.dft_module = self.dft_module.__name__
-        out_dict = deepcopy(dict(vars(self)))
-        self.dft_module = eval(self.dft_module)
+        # The GP and structure are stored in their own formats, so they are
+        # left out of the deepcopy along with the attributes that are dropped.
+        skipped = [
+            "gp",
+            "structure",
+            "dft_module",
+            "output",
+            "_log",
+            "pred_func",
+            "_rescale_steps_set",
+        ]
+        out_dict = deepcopy(
+            {key: value for key, value in vars(self).items() if key not in skipped}
+        )
 
+        out_dict["dft_module"] = self.dft_module.__name__
         out_dict["gp"] = self.gp_name
         out_dict["structure"] = self.structure.as_dict()
 
-        for key in ["output", "pred_func"]:
-            out_dict.pop(key)
-
         return out_dict
 
     @staticmethod
@@ -552,15 +597,17 @@ class OTF:
         return new_otf
 
     def checkpoint(self):
+        self.output.flush()
+
         name = self.checkpt_name
         if ".json" != name[-5:]:
             name += ".json"
         with open(name, "w") as f:
-            json.dump(self.as_dict(), f, cls=NumpyEncoder)
+            f.write(numpy_dumps(self.as_dict()))
 
     @classmethod
     def from_checkpoint(cls, filename):
         with open(filename, "r") as f:
-            otf_model = cls.from_dict(json.loads(f.readline()))
+            otf_model = cls.from_dict(json.load(f))
 
         return otf_model
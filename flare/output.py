@@ -9,6 +9,7 @@ import time
 import numpy as np
 
 from logging import FileHandler, StreamHandler, Logger
+from logging.handlers import MemoryHandler
 from os.path import isfile
 from shutil import move as movefile
 from typing import Union, List
@@ -20,6 +21,9 @@ from flare.utils.element_coder import Z_to_element
 # Unit conversions.
 eva_to_gpa = 160.21766208
 
+# Maximum number of records held by a buffered log before it is written out.
+_log_buffer_capacity = 10000
+
 
 class Output:
     """
@@ -37,6 +41,9 @@ class Output:
     :type verbose: str, optional
     :param always_flush: Always write to file instantly
     :type always_flus: bool, optional
+    :param buffered: Hold log records in memory until flush() is called (or
+        a warning is logged), instead of writing each record to file
+    :type buffered: bool, optional
     """
 
     def __init__(
@@ -45,6 +52,7 @@ class Output:
         verbose: str = "INFO",
         print_as_xyz: bool = False,
         always_flush: bool = False,
+        buffered: bool = False,
     ):
         """
         Construction. Open files.
@@ -52,6 +60,7 @@ class Output:
         self.basename = f"{basename}"
         self.print_as_xyz = print_as_xyz
         self.always_flush = always_flush
+        self.buffered = buffered
 
         filesuffix = {"log": ".out", "hyps": "-hyps.dat"}
         if print_as_xyz:
@@ -86,14 +95,30 @@ class Output:
         """
 
         if filetype not in self.logger:
-            set_logger(
+            logger = set_logger(
                 self.basename + filetype,
                 stream=False,
                 fileout_name=self.basename + suffix,
                 verbose=verbose,
             )
+            if self.buffered:
+                for i, handler in enumerate(logger.handlers):
+                    if isinstance(handler, FileHandler):
+                        logger.handlers[i] = MemoryHandler(
+                            _log_buffer_capacity,
+                            flushLevel=logging.WARNING,
+                            target=handler,
+                        )
             self.logger += [filetype]
 
+    def flush(self):
+        """
+        Write out everything logged so far to the log files.
+        """
+        for filetype in self.logger:
+            for handler in logging.getLogger(self.basename + filetype).handlers:
+                handler.flush()
+
     def write_to_log(self, logstring: str, name: str = "log", flush: bool = False):
         """
         Write any string to logfile
@@ -491,7 +516,7 @@ class Output:
 
         mae_per_species = {}
         count_per_species = {}
-        species = [Z_to_element(Z) for Z in set(frame.coded_species)]
+        species = [Z_to_element(Z) for Z in np.unique(frame.coded_species).tolist()]
         for ele in species:
             mae_per_species[ele] = 0
             count_per_species[ele] = 0
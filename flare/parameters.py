@@ -7,7 +7,6 @@ import pickle
 import time
 
 from copy import deepcopy
-from itertools import combinations_with_replacement, permutations
 from numpy.random import random
 from numpy import array as nparray
 from numpy import max as npmax
@@ -164,7 +163,7 @@ class Parameters:
             assert (
                 "species_mask" in param_dict
             ), "species_mask key missing in param_dict dictionary"
-            param_dict["species_mask"] = nparray(
+            param_dict["species_mask"] = np.asarray(
                 param_dict["species_mask"], dtype=int
             )
 
@@ -197,9 +196,10 @@ class Parameters:
                     f"{kernel}_mask" in param_dict
                 ), f"{kernel}_mask key missing in param_dict dictionary"
 
-                # check mask has the right dimension and values
-                mask = param_dict[f"{kernel}_mask"]
-                param_dict[f"{kernel}_mask"] = nparray(mask, dtype=np.int)
+                # check mask has the right dimension and values; masks which
+                # are already integer arrays are not copied
+                mask = np.asarray(param_dict[f"{kernel}_mask"], dtype=int)
+                param_dict[f"{kernel}_mask"] = mask
 
                 assert npmax(mask) < n
                 dim = Parameters.ndim[kernel]
@@ -208,24 +208,14 @@ class Parameters:
                     f" {len(mask)} != nspec ^ {dim} {nspecie**dim}"
                 )
 
-                # check whether the mask array is symmetrical
-                # enumerate all possible combinations
-                all_comb = list(combinations_with_replacement(np.arange(nspecie), dim))
-                for comb in all_comb:
-                    mask_value = None
-                    perm = list(permutations(comb))
-                    for ele_list in perm:
-                        mask_id = 0
-                        for ele in ele_list:
-                            mask_id += ele
-                            mask_id *= nspecie
-                        mask_id = mask_id // nspecie
-                        if mask_value == None:
-                            mask_value = mask[mask_id]
-                        else:
-                            assert (
-                                mask[mask_id] == mask_value
-                            ), f"{kernel}_mask has to be symmetrical"
+                # check whether the mask array is symmetrical, i.e. unchanged
+                # by any permutation of the species axes; swaps of adjacent
+                # axes generate all the permutations, so they are enough
+                mask_nd = mask.reshape((nspecie,) * dim)
+                for axis in range(dim - 1):
+                    assert np.array_equal(
+                        mask_nd, mask_nd.swapaxes(axis, axis + 1)
+                    ), f"{kernel}_mask has to be symmetrical"
 
                 if kernel not in list(Parameters.cutoff_types.keys()):
                     if kernel + "_cutoff_list" in param_dict:
@@ -249,8 +239,8 @@ class Parameters:
             ), "original hyper parameters have to be defined"
 
             # Ensure typed correctly as numpy array
-            param_dict["original_hyps"] = nparray(
-                param_dict["original_hyps"], dtype=np.float
+            param_dict["original_hyps"] = np.asarray(
+                param_dict["original_hyps"], dtype=float
             )
             if (len(param_dict["original_hyps"]) - 1) not in param_dict["map"]:
                 assert (
@@ -388,11 +378,23 @@ class Parameters:
         noise (bool): if True, the last element of returned hyper-parameters is
                       the noise variance.
         """
-        hyps = Parameters.get_hyps(param_dict, hyps=hyps)
+        if hyps is None:
+            hyps = param_dict["hyps"]
+
+        # The noise is the last hyper-parameter. When it is also the last one
+        # trained, read it directly instead of building the full list.
+        hyps_map = param_dict.get("map", None)
+        if hyps_map is None:
+            noise = hyps[-1]
+        elif len(hyps_map) > 0 and hyps_map[-1] == len(param_dict["original_hyps"]) - 1:
+            noise = hyps[len(hyps_map) - 1]
+        else:
+            noise = Parameters.get_hyps(param_dict, hyps=hyps)[-1]
+
         if constraint:
-            return hyps[-1], param_dict["train_noise"]
+            return noise, param_dict["train_noise"]
         else:
-            return hyps[-1]
+            return noise
 
     @staticmethod
     def get_cutoff(kernel_name, coded_species, param_dict):
@@ -41,6 +41,33 @@ def predict_on_atom(
     return force, std
 
 
+def predict_on_atoms(
+    param: Tuple[Structure, List[int], GaussianProcess]
+) -> ("np.ndarray", "np.ndarray"):
+    """
+    Return the forces/std. dev. uncertainty associated with a block of atoms
+    in a structure, predicted together with a single matrix product against
+    the training set. In order to work with other functions,
+    all arguments are passed in as a tuple.
+
+    :param param: tuple of FLARE Structure, list of atom indices, and
+        Gaussian Process object
+    :type param: Tuple(Structure, List[int], GaussianProcess)
+    :return: len(atoms) x 3 array of forces and associated uncertainties
+    :rtype: (np.ndarray, np.ndarray)
+    """
+    structure, atoms, gp = param
+    chemenvs = [
+        AtomicEnvironment(structure, atom, gp.cutoffs, cutoffs_mask=gp.hyps_mask)
+        for atom in atoms
+    ]
+
+    forces, var = gp.predict_forces_xyz(chemenvs)
+    stds = np.sqrt(np.abs(var))
+
+    return forces, stds
+
+
 def predict_on_atom_en(
     param: Tuple[Structure, int, GaussianProcess]
 ) -> ("np.ndarray", "np.ndarray", float):
@@ -69,6 +96,35 @@ def predict_on_atom_en(
     return force, std, local_energy
 
 
+def predict_on_atoms_en(
+    param: Tuple[Structure, List[int], GaussianProcess]
+) -> ("np.ndarray", "np.ndarray", "np.ndarray"):
+    """
+    Return the forces/std. dev. uncertainty / energy associated with a block
+    of atoms in a structure, with the forces of the block predicted together
+    as in predict_on_atoms. In order to work with other functions,
+    all arguments are passed in as a tuple.
+
+    :param param: tuple of FLARE Structure, list of atom indices, and
+        Gaussian Process object
+    :type param: Tuple(Structure, List[int], GaussianProcess)
+    :return: len(atoms) x 3 array of forces, associated uncertainties, and
+        len(atoms) array of local energies
+    :rtype: (np.ndarray, np.ndarray, np.ndarray)
+    """
+    structure, atoms, gp = param
+    chemenvs = [
+        AtomicEnvironment(structure, atom, gp.cutoffs, cutoffs_mask=gp.hyps_mask)
+        for atom in atoms
+    ]
+
+    forces, var = gp.predict_forces_xyz(chemenvs)
+    stds = np.sqrt(np.abs(var))
+    local_energies = np.array([gp.predict_local_energy(env) for env in chemenvs])
+
+    return forces, stds, local_energies
+
+
 def predict_on_atom_en_std(param):
     """Predict local energy and predictive std of a chemical environment."""
 
@@ -99,6 +155,7 @@ def predict_on_structure(
     write_to_structure: bool = True,
     selective_atoms: List[int] = None,
     skipped_atom_value=0,
+    batch_size: int = 64,
 ) -> ("np.ndarray", "np.ndarray"):
     """
     Return the forces/std. dev. uncertainty associated with each
@@ -114,6 +171,8 @@ def predict_on_structure(
     :param skipped_atom_value: What value to use for atoms that are skipped.
             Defaults to 0 but other options could be e.g. NaN. Will NOT
             write this to the structure if write_to_structure is True.
+    :param batch_size: Number of atoms whose kernel vectors are stacked
+        into one matrix for prediction.
     :return: N x 3 numpy array of foces, Nx3 numpy array of uncertainties
     :rtype: (np.ndarray, np.ndarray)
     """
@@ -127,24 +186,25 @@ def predict_on_structure(
     else:
         selective_atoms = []
 
-    for n in range(structure.nat):
-
-        # Skip the atoms which we aren't predicting on if
-        # selective atoms is on.
-        if n not in selective_atoms and selective_atoms:
-            continue
-
-        chemenv = AtomicEnvironment(structure, n, gp.cutoffs, cutoffs_mask=gp.hyps_mask)
+    # Skip the atoms which we aren't predicting on if
+    # selective atoms is on.
+    if selective_atoms:
+        atoms = [n for n in range(structure.nat) if n in selective_atoms]
+    else:
+        atoms = list(range(structure.nat))
 
-        force, var = gp.predict_force_xyz(chemenv)
-        std = np.sqrt(np.abs(var))
+    # Predict on blocks of atoms, so that each block needs a single
+    # matrix product with the GP's inverse covariance matrix.
+    for start in range(0, len(atoms), batch_size):
+        block = atoms[start : start + batch_size]
+        force, std = predict_on_atoms((structure, block, gp))
 
-        forces[n] = force
-        stds[n] = std
+        forces[block] = force
+        stds[block] = std
 
         if write_to_structure:
-            structure.forces[n] = force
-            structure.stds[n] = std
+            structure.forces[block] = force
+            structure.stds[block] = std
 
     return forces, stds
 
@@ -156,6 +216,7 @@ def predict_on_structure_par(
     write_to_structure: bool = True,
     selective_atoms: List[int] = None,
     skipped_atom_value=0,
+    pool: "mp.pool.Pool" = None,
 ) -> ("np.ndarray", "np.ndarray"):
 
     """
@@ -173,6 +234,8 @@ def predict_on_structure_par(
     :param skipped_atom_value: What value to use for atoms that are skipped.
             Defaults to 0 but other options could be e.g. NaN. Will NOT
             write this to the structure if write_to_structure is True.
+    :param pool: Process pool to parallelize over, reused across calls. If
+        None, a pool is created for this call and closed afterwards.
     :return: N x 3 array of forces, N x 3 array of uncertainties
     :rtype: (np.ndarray, np.ndarray)
     """
@@ -197,33 +260,41 @@ def predict_on_structure_par(
     else:
         selective_atoms = []
 
-    # Automatically detect number of cpus available.
+    # Reuse the pool passed in, or automatically detect number of cpus
+    # available.
     if n_cpus is None:
-        pool = mp.Pool(processes=mp.cpu_count())
-    else:
+        n_cpus = mp.cpu_count()
+    own_pool = pool is None
+    if own_pool:
         pool = mp.Pool(processes=n_cpus)
 
-    # Parallelize over atoms in structure.
-    results = []
-    for atom in range(structure.nat):
-        # If selective atoms is on, skip ones that was skipped.
-        if atom not in selective_atoms and selective_atoms:
-            # Keep length of results equal to nat.
-            results.append(None)
-            continue
-        results.append(pool.apply_async(predict_on_atom, args=[(structure, atom, gp)]))
-    pool.close()
-    pool.join()
+    # If selective atoms is on, skip ones that was skipped.
+    if selective_atoms:
+        atoms = [n for n in range(structure.nat) if n in selective_atoms]
+    else:
+        atoms = list(range(structure.nat))
 
-    for i in range(structure.nat):
-        if i not in selective_atoms and selective_atoms:
+    # Parallelize over one block of atoms per process, so that the structure
+    # and GP are sent to each worker once rather than once per atom.
+    results = []
+    for block in np.array_split(atoms, n_cpus):
+        if len(block) == 0:
             continue
-        r = results[i].get()
-        forces[i] = r[0]
-        stds[i] = r[1]
+        block = block.tolist()
+        results.append(
+            (block, pool.apply_async(predict_on_atoms, args=[(structure, block, gp)]))
+        )
+    if own_pool:
+        pool.close()
+        pool.join()
+
+    for block, result in results:
+        r = result.get()
+        forces[block] = r[0]
+        stds[block] = r[1]
         if write_to_structure:
-            structure.forces[i] = r[0]
-            structure.stds[i] = r[1]
+            structure.forces[block] = r[0]
+            structure.stds[block] = r[1]
 
     return forces, stds
 
@@ -490,6 +561,7 @@ def predict_on_structure_par_en(
     write_to_structure: bool = True,
     selective_atoms: List[int] = None,
     skipped_atom_value=0,
+    pool: "mp.pool.Pool" = None,
 ) -> ("np.ndarray", "np.ndarray", "np.ndarray"):
     """
     Return the forces/std. dev. uncertainty / local energy associated with each
@@ -499,6 +571,8 @@ def predict_on_structure_par_en(
     :param structure: FLARE structure to obtain forces for, with N atoms
     :param gp: Gaussian Process model
     :param n_cpus: Number of cores to parallelize over
+    :param pool: Process pool to parallelize over, reused across calls. If
+        None, a pool is created for this call and closed afterwards.
     :return: N x 3 array of forces, N x 3 array of uncertainties,
         N-length array of energies
     :rtype: (np.ndarray, np.ndarray, np.ndarray)
@@ -526,43 +600,160 @@ def predict_on_structure_par_en(
     else:
         selective_atoms = []
 
+    # Reuse the pool passed in, or automatically detect number of cpus
+    # available.
     if n_cpus is None:
-        pool = mp.Pool(processes=mp.cpu_count())
-    else:
+        n_cpus = mp.cpu_count()
+    own_pool = pool is None
+    if own_pool:
         pool = mp.Pool(processes=n_cpus)
 
-    # Parallelize over atoms in structure
-    results = []
-    for atom_i in range(structure.nat):
+    # If selective atoms is on, skip ones that was skipped.
+    if selective_atoms:
+        atoms = [n for n in range(structure.nat) if n in selective_atoms]
+    else:
+        atoms = list(range(structure.nat))
 
-        if atom_i not in selective_atoms and selective_atoms:
-            results.append(None)
+    # Parallelize over one block of atoms per process, as in
+    # predict_on_structure_par.
+    results = []
+    for block in np.array_split(atoms, n_cpus):
+        if len(block) == 0:
             continue
-
+        block = block.tolist()
         results.append(
-            pool.apply_async(predict_on_atom_en, args=[(structure, atom_i, gp)])
+            (
+                block,
+                pool.apply_async(predict_on_atoms_en, args=[(structure, block, gp)]),
+            )
         )
-    pool.close()
-    pool.join()
+    if own_pool:
+        pool.close()
+        pool.join()
 
     # Compile results
-    for i in range(structure.nat):
-
-        if i not in selective_atoms and selective_atoms:
-            continue
-
-        r = results[i].get()
-        forces[i][:] = r[0]
-        stds[i][:] = r[1]
-        local_energies[i] = r[2]
+    for block, result in results:
+        r = result.get()
+        forces[block] = r[0]
+        stds[block] = r[1]
+        local_energies[block] = r[2]
 
         if write_to_structure:
-            structure.forces[i] = forces[i]
-            structure.stds[i] = stds[i]
+            structure.forces[block] = r[0]
+            structure.stds[block] = r[1]
 
     return forces, stds, local_energies
 
 
+def predict_on_structures_par(
+    structures: List[Structure],
+    gp: GaussianProcess,
+    n_cpus: int = None,
+    selective_atoms: List[List[int]] = None,
+    skipped_atom_value=0,
+    energy: bool = False,
+    pool: "mp.pool.Pool" = None,
+) -> List[Tuple["np.ndarray", ...]]:
+    """
+    Return the forces/std. dev. uncertainty (and optionally local energies)
+    associated with each individual atom of a batch of structures,
+    parallelized over the atoms of all structures at once so that a single pool
+    serves the whole batch. Results are NOT written to the structures.
+
+    :param structures: List of FLARE structures to obtain forces for
+    :param gp: Gaussian Process model
+    :param n_cpus: Number of cores to parallelize over
+    :param selective_atoms: For each structure, only predict on these atoms;
+        None or an empty list predicts on every atom of the structure
+    :param skipped_atom_value: What value to use for atoms that are skipped.
+    :param energy: Also predict the local energy of each atom
+    :param pool: Process pool to parallelize over, reused across calls. If
+        None, a pool is created for this call and closed afterwards.
+    :return: For each structure, a tuple of N x 3 array of forces, N x 3
+        array of uncertainties and, if energy is True, N-length array of
+        local energies
+    :rtype: List[Tuple[np.ndarray, ...]]
+    """
+
+    if selective_atoms is None:
+        selective_atoms = [None] * len(structures)
+
+    # Work in serial if the number of cpus is 1
+    # or the gp is not parallelized by atoms
+    if n_cpus == 1 or not gp.per_atom_par:
+        pred_func = predict_on_structure_en if energy else predict_on_structure
+        return [
+            pred_func(
+                structure,
+                gp,
+                n_cpus,
+                write_to_structure=False,
+                selective_atoms=atoms,
+                skipped_atom_value=skipped_atom_value,
+            )
+            for structure, atoms in zip(structures, selective_atoms)
+        ]
+
+    pred_block_func = predict_on_atoms_en if energy else predict_on_atoms
+
+    # Reuse the pool passed in, or automatically detect number of cpus
+    # available.
+    if n_cpus is None:
+        n_cpus = mp.cpu_count()
+    own_pool = pool is None
+    if own_pool:
+        pool = mp.Pool(processes=n_cpus)
+
+    # Parallelize over n_cpus blocks of atoms per structure, so that each
+    # structure and the GP are sent to a worker once per block rather than
+    # once per atom.
+    results = []
+    for structure, atoms in zip(structures, selective_atoms):
+        if not atoms:
+            atoms = range(structure.nat)
+        block_results = []
+        for block in np.array_split(atoms, n_cpus):
+            if len(block) == 0:
+                continue
+            block = block.tolist()
+            block_results.append(
+                (
+                    block,
+                    pool.apply_async(pred_block_func, args=[(structure, block, gp)]),
+                )
+            )
+        results.append(block_results)
+    if own_pool:
+        pool.close()
+        pool.join()
+
+    # Compile results by structure
+    predictions = []
+    for structure, block_results, atoms in zip(structures, results, selective_atoms):
+        forces = np.zeros((structure.nat, 3))
+        stds = np.zeros((structure.nat, 3))
+        local_energies = np.zeros(structure.nat)
+
+        if atoms:
+            forces.fill(skipped_atom_value)
+            stds.fill(skipped_atom_value)
+            local_energies.fill(skipped_atom_value)
+
+        for block, result in block_results:
+            r = result.get()
+            forces[block] = r[0]
+            stds[block] = r[1]
+            if energy:
+                local_energies[block] = r[2]
+
+        if energy:
+            predictions.append((forces, stds, local_energies))
+        else:
+            predictions.append((forces, stds))
+
+    return predictions
+
+
 def predict_on_atom_mgp(atom: int, structure, mgp, write_to_structure=False):
     chemenv = AtomicEnvironment(
         structure, atom, mgp.cutoffs, cutoffs_mask=mgp.hyps_mask
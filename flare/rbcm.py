@@ -352,6 +352,32 @@ class RobustBayesianCommitteeMachine(GaussianProcess):
         if train:
             self.train(**kwargs)
 
+    def add_envs(
+        self,
+        envs: List[AtomicEnvironment],
+        forces=None,
+        train: bool = False,
+        **kwargs,
+    ):
+        """Add a list of local environments to the training set, each to the
+        next available expert.
+        Args:
+            envs (List[AtomicEnvironment]): Local environments to be added to
+                the training set of the GP.
+            forces (np.ndarray): Forces on the central atoms of the local
+                environments. If None, the forces of the environments are used.
+            train (bool): If True, the GP is trained after the local
+                environments are added.
+        """
+        if forces is None:
+            forces = [env.force for env in envs]
+
+        for env, force in zip(envs, forces):
+            self.add_one_env(env, force, train=False)
+
+        if train:
+            self.train(**kwargs)
+
     def train(
         self,
         logger_name=None,
@@ -644,6 +670,22 @@ class RobustBayesianCommitteeMachine(GaussianProcess):
             stds.append(std)
         return np.array(forces), np.array(stds)
 
+    def predict_forces_xyz(
+        self, envs: List[AtomicEnvironment]
+    ) -> ("np.ndarray", "np.ndarray"):
+        """
+        Predict all three force components of several local environments.
+        The experts are combined per component, so this loops over
+        predict_force_xyz.
+        :param envs: Input local environments.
+        :return: Means and variances, each of shape (len(envs), 3).
+        """
+        forces = np.zeros((len(envs), 3))
+        variances = np.zeros((len(envs), 3))
+        for i, x_t in enumerate(envs):
+            forces[i], variances[i] = self.predict_force_xyz(x_t)
+        return forces, variances
+
     def set_L_alpha(self):
         """
         Set the lower-triangular (L) version of the covariance matrix and alpha vector (
@@ -951,19 +993,20 @@ class RobustBayesianCommitteeMachine(GaussianProcess):
         data = {}
 
         # Count all of the present species in the atomic env. data
-        present_species = []
+        counts_by_Z = Counter()
         data["N"] = 0
         for i in range(self.n_experts):
             data["N"] += self.n_envs_prev[i]
             data[f"N_{i}"] = self.n_envs_prev[i]
-            for env, _ in zip(self.training_data[i], self.training_labels[i]):
-                present_species.append(
-                    Z_to_element(env.structure.coded_species[env.atom])
-                )
+            counts_by_Z.update(
+                env.structure.coded_species[env.atom]
+                for env, _ in zip(self.training_data[i], self.training_labels[i])
+            )
+        envs_by_species = {Z_to_element(Z): n for Z, n in counts_by_Z.items()}
 
         # Summarize the relevant information
-        data["species"] = list(set(present_species))
-        data["envs_by_species"] = dict(Counter(present_species))
+        data["species"] = list(envs_by_species)
+        data["envs_by_species"] = envs_by_species
 
         return data
 
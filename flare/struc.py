@@ -81,7 +81,9 @@ class Structure:
             self.species_labels = species
         else:
             self.species_labels = species_labels
-        self.coded_species = np.array([element_to_Z(spec) for spec in species])
+        # Code each distinct species once
+        codes = {spec: element_to_Z(spec) for spec in set(species)}
+        self.coded_species = np.array([codes[spec] for spec in species])
         self.nat = len(species)
 
         # Default: atoms have no velocity
@@ -2,12 +2,20 @@
 Utility functions for various tasks.
 """
 from warnings import warn
-from json import JSONEncoder
+from json import JSONEncoder, dumps
 from typing import List
 from math import inf
 
 import numpy as np
 
+try:
+    # Faster serialization of NumPy data in numpy_dumps
+    import orjson
+
+    _orjson_present = True
+except ImportError:
+    _orjson_present = False
+
 _user_element_to_Z = {}
 _user_Z_to_element = {}
 
@@ -188,14 +196,16 @@ def element_to_Z(element: str) -> int:
         return int(element)
 
     # Check that a valid element was passed in then return
-    if _element_to_Z.get(element, None) is None:
+    Z = _element_to_Z.get(element, None)
+    if Z is None:
         warn(
             f"Element as specified not found in list of element-Z mappings. "
             f"If you would like to specify a custom element, use an integer"
             f" of your choosing instead. Setting element {{element}} to intege"
             f"r 0"
         )
-    return _element_to_Z.get(element, 0)
+        return 0
+    return Z
 
 
 class NumpyEncoder(JSONEncoder):
@@ -239,6 +249,50 @@ class NumpyEncoder(JSONEncoder):
         return JSONEncoder.default(self, obj)
 
 
+def _has_non_finite(obj) -> bool:
+    """
+    Check whether an object to be serialized contains a NaN or infinite
+    float, looking into dicts, lists, tuples and NumPy arrays.
+
+    :param obj: Object to check.
+    :return: True if a non-finite float was found.
+    """
+    if isinstance(obj, (float, np.floating)):
+        return not np.isfinite(obj)
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind in "fc":
+            return not np.isfinite(obj).all()
+        if obj.dtype.kind == "O":
+            return any(_has_non_finite(o) for o in obj.flat)
+        return False
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(o) for o in obj)
+    return False
+
+
+def numpy_dumps(obj) -> str:
+    """
+    Serialize an object which may contain NumPy arrays and scalars to a JSON
+    string, like json.dumps(obj, cls=NumpyEncoder). Uses orjson if it is
+    installed (pip install mir-flare[orjson]), which serializes NumPy data
+    natively; the output is then compact, without spaces after separators.
+    orjson would write NaN and Infinity as null, so objects containing
+    non-finite floats are serialized with json.dumps instead.
+
+    :param obj: Object to serialize.
+    :return: JSON string.
+    """
+    if _orjson_present and not _has_non_finite(obj):
+        return orjson.dumps(
+            obj,
+            default=NumpyEncoder().default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+    return dumps(obj, cls=NumpyEncoder)
+
+
 def Z_to_element(Z: int) -> str:
     """
     Maps atomic numbers Z to element name, e.g. 1->"H".
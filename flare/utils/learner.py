@@ -3,10 +3,11 @@ Utility functions for various tasks.
 """
 from warnings import warn
 from json import JSONEncoder
-from typing import List
+from typing import List, Dict
 from math import inf
 
 import numpy as np
+from numba import njit
 
 
 def is_std_in_bound(
@@ -55,26 +56,26 @@ def is_std_in_bound(
     else:
         threshold = np.abs(std_tolerance)
 
-    # sort max stds
-    nat = len(structure)
-    max_stds = np.zeros((nat))
-    for atom, std in enumerate(structure.stds):
-        max_stds[atom] = np.max(std)
-    stds_sorted = np.argsort(max_stds)
+    # max std of each atom; nothing needs sorting if all are in bound
+    # (written as "not >" so that a NaN std counts as in bound)
+    max_stds = np.max(structure.stds, axis=1)
+    if not max_stds.max() > threshold:
+        return True, [-1]
 
+    nat = len(max_stds)
     if update_style == "add_n":
-        target_atoms = list(stds_sorted[-max_atoms_added:])
+        if max_atoms_added is not None and 0 < max_atoms_added < nat:
+            # partial selection of the highest stds, in ascending order
+            top = np.argpartition(max_stds, nat - max_atoms_added)
+            top = top[nat - max_atoms_added :]
+            target_atoms = list(top[np.argsort(max_stds[top])])
+        else:
+            target_atoms = list(np.argsort(max_stds))
     elif update_style == "threshold":
-        target_atoms = []
-        for atom_index in stds_sorted:
-            if max_stds[atom_index] > update_threshold:
-                target_atoms.append(atom_index)
+        stds_sorted = np.argsort(max_stds)
+        target_atoms = list(stds_sorted[max_stds[stds_sorted] > update_threshold])
 
-    # if above threshold, return atom
-    if max_stds[stds_sorted[-1]] > threshold:
-        return False, target_atoms
-    else:
-        return True, [-1]
+    return False, target_atoms
 
 
 def is_std_in_bound_per_species(
@@ -130,35 +131,21 @@ def is_std_in_bound_per_species(
 
     # Determine if any std component will trigger the threshold
     # before looking through individual species.
-    max_std_components = [np.nanmax(std) for std in structure.stds]
-    if np.nanmax(max_std_components) < threshold:
+    stds = np.asarray(structure.stds, dtype=float)
+    max_std_components = np.empty(stds.shape[0])
+    _nanmax_by_atom(stds, max_std_components)
+    if not np.any(max_std_components >= threshold):
         return True, [-1]
 
-    target_atoms = []
-
-    # Sort from greatest to smallest max. std component
+    # Sort from greatest to smallest max. std component, and keep the atoms
+    # above threshold (atoms with NaN uncertainties are never kept)
     std_arg_sorted = np.flip(np.argsort(max_std_components))
+    candidates = std_arg_sorted[max_std_components[std_arg_sorted] >= threshold]
 
-    present_species = {spec: 0 for spec in set(structure.species_labels)}
-
-    # Loop through atoms and add until cutoffs are met.
-    for i in std_arg_sorted:
-
-        # If max atoms added reached or stds of atoms considered are now below
-        # threshold, conclude
-        if len(target_atoms) == max_atoms_added or (
-            max_std_components[i] < threshold and max_std_components[i] != np.nan
-        ):
-            break
-
-        if np.isnan(max_std_components[i]):
-            continue
-
-        # Only add up to species allowance, if it exists
-        cur_spec = structure.species_labels[i]
-        if present_species[cur_spec] < max_by_species.get(cur_spec, inf):
-            target_atoms.append(i)
-            present_species[cur_spec] += 1
+    # Only add up to species allowance, if it exists
+    target_atoms = _limit_atoms_by_species(
+        candidates, structure.species_labels, max_atoms_added, max_by_species
+    )
 
     # Check in case that nothing was added, e.g. due to species limitations
     if len(target_atoms):
@@ -175,6 +162,7 @@ def is_force_in_bound_per_species(
     max_atoms_added: int = inf,
     max_by_species: dict = {},
     max_force_error: float = inf,
+    max_error_components: "ndarray" = None,
 ) -> (bool, List[int]):
     """
     Checks the forces of GP prediction assigned to the structure against a
@@ -201,6 +189,9 @@ def is_force_in_bound_per_species(
     :param max_by_species: Limit to a maximum number of atoms by species
     :param max_force_error: In order to avoid counting in highly unlikely
         configurations, if the error exceeds this, do not add atom
+    :param max_error_components: Largest absolute force error component of
+        each atom, as returned by force_errors; computed from the predicted
+        and label forces if not given
     :return: Bool indicating if any atoms exceeded the error
         threshold, and a list of indices of atoms which did sorted by their
         error.
@@ -211,40 +202,24 @@ def is_force_in_bound_per_species(
     if abs_force_tolerance == 0:
         return True, [-1]
 
-    errors = np.abs(predicted_forces - label_forces)
-
     # Determine if any force component will trigger the threshold
-    max_error_components = np.amax(errors, axis=1)
+    if max_error_components is None:
+        max_error_components = np.amax(np.abs(predicted_forces - label_forces), axis=1)
     if np.nanmax(max_error_components) < abs_force_tolerance:
         return True, [-1]
 
-    target_atoms = []
-
-    # Sort from greatest to smallest error
+    # Sort from greatest to smallest error, and keep the atoms with errors
+    # between the bounds (atoms with NaN errors are never kept)
     force_arg_sorted = np.flip(np.argsort(max_error_components))
-
-    present_species = {spec: 0 for spec in set(structure.species_labels)}
-
-    # Only add atoms up to the bound
-    for i in force_arg_sorted:
-
-        # If max atoms added reached or force errors are now below threshold,
-        # conclude
-        if len(target_atoms) == max_atoms_added or (
-            max_error_components[i] < abs_force_tolerance
-            and max_error_components[i] != np.nan
-        ):
-            break
-
-        cur_spec = structure.species_labels[i]
-
-        # Only add up to species allowance, if it exists
-        if (
-            present_species[cur_spec] < max_by_species.get(cur_spec, inf)
-            and max_error_components[i] < max_force_error
-        ):
-            target_atoms.append(i)
-            present_species[cur_spec] += 1
+    sorted_errors = max_error_components[force_arg_sorted]
+    candidates = force_arg_sorted[
+        (sorted_errors >= abs_force_tolerance) & (sorted_errors < max_force_error)
+    ]
+
+    # Only add up to species allowance, if it exists
+    target_atoms = _limit_atoms_by_species(
+        candidates, structure.species_labels, max_atoms_added, max_by_species
+    )
 
     # Check in case that nothing was added e.g. due to species or error
     # limitations
@@ -254,6 +229,91 @@ def is_force_in_bound_per_species(
         return True, [-1]
 
 
+def force_errors(
+    predicted_forces: "ndarray", label_forces: "ndarray", dtype: "np.dtype" = float
+) -> ("ndarray", "ndarray"):
+    """
+    Compute the absolute force errors of a structure and the largest error
+    component of each atom in a single pass over the forces. Atoms with a
+    NaN force component have a NaN largest error.
+
+    :param predicted_forces: Force predictions made by GP model
+    :param label_forces: "True" forces computed by DFT
+    :param dtype: Precision of the returned errors
+    :return: Absolute errors of shape (N, 3), and the largest absolute error
+        component of each atom of shape (N,)
+    """
+    predicted_forces = np.asarray(predicted_forces)
+    errors = np.empty(predicted_forces.shape, dtype=dtype)
+    max_errors = np.empty(predicted_forces.shape[0], dtype=dtype)
+    _fused_force_errors(predicted_forces, np.asarray(label_forces), errors, max_errors)
+    return errors, max_errors
+
+
+@njit
+def _fused_force_errors(predicted_forces, label_forces, errors, max_errors):
+    for atom in range(predicted_forces.shape[0]):
+        max_error = 0.0
+        for comp in range(predicted_forces.shape[1]):
+            error = abs(predicted_forces[atom, comp] - label_forces[atom, comp])
+            errors[atom, comp] = error
+            if error > max_error or np.isnan(error):
+                max_error = error
+        max_errors[atom] = max_error
+
+
+@njit
+def _nanmax_by_atom(values, max_values):
+    # Largest non-NaN component of each atom, NaN if every component is NaN
+    for atom in range(values.shape[0]):
+        max_value = np.nan
+        for comp in range(values.shape[1]):
+            value = values[atom, comp]
+            if np.isnan(max_value) or value > max_value:
+                max_value = value
+        max_values[atom] = max_value
+
+
+def _limit_atoms_by_species(
+    candidates: "np.ndarray",
+    species_labels: List[str],
+    max_atoms_added: int = inf,
+    max_by_species: dict = {},
+) -> List[int]:
+    """
+    Keep the first candidate atoms of each species up to the allowance of
+    that species, and at most max_atoms_added atoms in total.
+
+    :param candidates: Indices of atoms in order of priority
+    :param species_labels: Species of every atom in the structure
+    :param max_atoms_added: Maximum number of atoms to return
+    :param max_by_species: Dictionary describing maximum number of atoms to
+        return by species
+    :return: Indices of the kept atoms, in order of priority
+    """
+
+    if len(candidates) == 0:
+        return []
+
+    # Count the occurrences of each species before every candidate
+    labels, inverse = np.unique(
+        np.asarray(species_labels)[candidates], return_inverse=True
+    )
+    order = np.argsort(inverse, kind="stable")
+    group_starts = np.searchsorted(inverse[order], inverse[order])
+    rank_in_species = np.empty(len(candidates), dtype=np.int64)
+    rank_in_species[order] = np.arange(len(candidates)) - group_starts
+
+    allowance = np.array([max_by_species.get(label, inf) for label in labels])
+    target_atoms = candidates[rank_in_species < allowance[inverse]]
+
+    # None or inf means no cap on the total number of atoms
+    if max_atoms_added is not None and max_atoms_added < len(target_atoms):
+        target_atoms = target_atoms[: int(max_atoms_added)]
+
+    return target_atoms.tolist()
+
+
 def subset_of_frame_by_element(
     frame: "flare.Structure", predict_atoms_per_element: dict
 ) -> List[int]:
@@ -270,19 +330,14 @@ def subset_of_frame_by_element(
     if not predict_atoms_per_element:
         return list(range(len(frame)))
 
-    # Keep track of atoms which were considered (dictionary may only cover a
-    #  subset of species of the whole frame)
-    all_atoms = set(range(len(frame)))
-    return_atoms = []
-    considered_atoms = set([])
-
-    species = frame.species_labels
+    # Atoms of species not covered by the dictionary are always kept
+    species = np.asarray(frame.species_labels)
+    keep = np.ones(len(species), dtype=bool)
 
     # Main loop: Obtain the number of relevant atoms for each element
     for elt, n in predict_atoms_per_element.items():
 
-        matching_atoms = [i for i in all_atoms if species[i] == elt]
-        considered_atoms.update(matching_atoms)
+        matching_atoms = np.flatnonzero(species == elt)
 
         if len(matching_atoms) == 0:
             continue
@@ -290,13 +345,33 @@ def subset_of_frame_by_element(
         to_add_atoms = np.random.choice(
             matching_atoms, replace=False, size=min(n, len(matching_atoms))
         )
-        return_atoms += list(to_add_atoms)
+        keep[matching_atoms] = False
+        keep[to_add_atoms] = True
+
+    return np.flatnonzero(keep).tolist()
 
-    return_atoms += list(all_atoms - considered_atoms)
 
-    return_atoms.sort()
+def indices_by_species(frame: "flare.Structure") -> Dict[int, np.ndarray]:
+    """
+    Group the atom indices of a structure by their coded species in a single
+    pass over the species array.
+
+    :param frame: FLARE Structure
+    :return: Dictionary mapping each atomic number present in the structure
+        to a sorted array of the indices of the atoms of that species
+    """
+
+    codes = np.asarray(frame.coded_species)
+    order = np.argsort(codes, kind="stable")
+    unique_codes, starts, counts = np.unique(
+        codes[order], return_index=True, return_counts=True
+    )
+    ends = starts + counts
 
-    return return_atoms
+    return {
+        int(code): order[start:end]
+        for code, start, end in zip(unique_codes, starts, ends)
+    }
 
 
 def get_max_cutoff(cell: np.ndarray) -> float:
@@ -355,6 +430,7 @@ def evaluate_training_atoms(
     max_elts_per_frame: dict = None,
     max_model_elts: dict = None,
     training_statistics: dict = None,
+    max_force_errors: "np.ndarray" = None,
 ):
     # Set max elements per frame based on model size.
     # E.g. if model will have at most 100 Carbon atoms,
@@ -394,13 +470,15 @@ def evaluate_training_atoms(
             max_atoms_added=max_atoms_from_frame,
             max_by_species=max_atoms_by_elt,
             max_force_error=max_force_error,
+            max_error_components=max_force_errors,
         )
     else:
         force_in_bound = True
-        force_train_atoms = {-1}
+        force_train_atoms = [-1]
 
     in_bound = std_in_bound and force_in_bound
 
-    train_atoms = list(set(force_train_atoms).union(std_train_atoms) - {-1})
+    train_atoms = np.union1d(force_train_atoms, std_train_atoms)
+    train_atoms = train_atoms[train_atoms != -1].astype(int).tolist()
 
     return in_bound, train_atoms
@@ -110,8 +110,7 @@ import numpy as np
 import pickle
 import time
 
-from copy import deepcopy
-from itertools import combinations_with_replacement, permutations
+from itertools import combinations_with_replacement
 from numpy import array as nparray
 from numpy import max as npmax
 from numpy.random import random as nprandom
@@ -122,6 +121,14 @@ from flare.parameters import Parameters
 from flare.utils.element_coder import element_to_Z, Z_to_element
 
 
+def _name_key(name):
+    """Hashable key of a group name; specie groups defined by a list of
+    elements are named by that list"""
+    if isinstance(name, list):
+        return tuple(name)
+    return name
+
+
 class ParameterHelper:
     """
     A helper class to construct the hyps_mask dictionary for AtomicEnvironment
@@ -210,6 +217,9 @@ class ParameterHelper:
         # names of each group {'specie': ['group1', 'group2'], 'twobody':
         # ['twobody0', 'twobody1']}
         self.all_group_names = {}
+        # index of each group name {'specie': {'group1': 0, 'group2': 1}},
+        # keyed by _name_key
+        self._name_to_id = {}
         # joint list of all the keys in self.all_group_names
         self.all_names = []
 
@@ -219,6 +229,7 @@ class ParameterHelper:
             self.groups[group_type] = []
             self.all_members[group_type] = []
             self.all_group_names[group_type] = []
+            self._name_to_id[group_type] = {}
 
         # store parameters, key should be the one used in
         # all_group_names or kernel_name
@@ -578,27 +589,28 @@ class ParameterHelper:
                 "* is reserved for substitution, cannot be used as a group name"
             )
 
+        name_key = _name_key(name)
+
         if group_type != "specie":
 
             assert len(element_list) == ParameterHelper.ndim[group_type]
 
             # Check all the other group_type to
-            exclude_list = deepcopy(self.all_types)
-            ide = exclude_list.index(group_type)
-            exclude_list.pop(ide)
+            exclude_list = [gt for gt in self.all_types if gt != group_type]
 
             for gt in exclude_list:
-                if name in self.all_group_names[gt]:
+                if name_key in self._name_to_id[gt]:
                     raise ValueError(
                         "group name has to be unique across all types. "
                         f"{name} is found in type {gt}"
                     )
 
-        if name in self.all_group_names[group_type]:
-            groupid = self.all_group_names[group_type].index(name)
+        if name_key in self._name_to_id[group_type]:
+            groupid = self._name_to_id[group_type][name_key]
         else:
             groupid = self.n[group_type]
             self.all_group_names[group_type].append(name)
+            self._name_to_id[group_type][name_key] = groupid
             self.groups[group_type].append([])
             self.n[group_type] += 1
 
@@ -619,7 +631,7 @@ class ParameterHelper:
             if atomic_str:
                 for ele_name in element_list:
                     if ele_name == "*":
-                        gid += ["*"]
+                        group_name_list += ["*"]
                     else:
                         for idx in range(self.n["specie"]):
                             group_name = self.all_group_names["specie"][idx]
@@ -635,23 +647,26 @@ class ParameterHelper:
 
             if "*" not in group_name_list:
 
-                gid = []
-                for ele_name in group_name_list:
-                    gid += [self.all_group_names["specie"].index(ele_name)]
+                gid = [self._specie_group_id(ele_name) for ele_name in group_name_list]
 
-                for ele in self.all_members[group_type]:
-                    if set(gid) == set(ele):
-                        self.logger.debug(
-                            f"the definition of {group_type} {ele} will be overriden"
-                        )
+                # only look for the overriden definitions when they are logged
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    gid_set = set(gid)
+                    for ele in self.all_members[group_type]:
+                        if gid_set == set(ele):
+                            self.logger.debug(
+                                f"the definition of {group_type} {ele} will be "
+                                "overriden"
+                            )
                 self.groups[group_type][groupid].append(gid)
                 self.all_members[group_type].append(gid)
                 self.logger.debug(f"{group_type} {gid} will be defined as group {name}")
                 if parameters is not None:
                     self.set_parameters(name, parameters)
             else:
-                one_star_less = deepcopy(group_name_list)
-                idstar = group_name_list.index("*")
+                # the names are strings, so a shallow copy is enough
+                one_star_less = list(group_name_list)
+                idstar = one_star_less.index("*")
                 one_star_less.pop(idstar)
                 for sub in self.all_group_names["specie"]:
                     self.logger.debug(f"{sub}, {one_star_less}")
@@ -663,6 +678,18 @@ class ParameterHelper:
                         atomic_str=False,
                     )
 
+    def _specie_group_id(self, name):
+        """Return the index of a specie group from its name
+
+        Args:
+            name (str): name of the specie group
+        """
+
+        try:
+            return self._name_to_id["specie"][_name_key(name)]
+        except KeyError:
+            raise ValueError(f"{name} is not a defined specie group") from None
+
     def find_group(self, group_type, element_list, atomic_str=False):
         """find the group that contains the input pair
 
@@ -694,9 +721,7 @@ class ParameterHelper:
             if "*" in element_list:
                 self.logger.debug("* cannot be used for find")
                 return None
-            gid = []
-            for ele_name in element_list:
-                gid += [self.all_group_names["specie"].index(ele_name)]
+            gid = [self._specie_group_id(ele_name) for ele_name in element_list]
             name = None
             for igroup in range(self.n[group_type]):
                 gname = self.all_group_names[group_type][igroup]
@@ -797,9 +822,12 @@ class ParameterHelper:
         parameter.
         """
 
-        if name == "noise":
-            self.opt["noise"] = opt
-            self.logger.debug(f"noise opt is set to{opt}")
+        if name in ["noise", "energy_noise", "sigma", "lengthscale"]:
+            self.opt[name] = opt
+            self.logger.debug(f"{name} opt is set to{opt}")
+            return
+        elif "cutoff" in name:
+            # cutoffs are never optimized
             return
 
         if isinstance(opt, bool):
@@ -831,23 +859,24 @@ class ParameterHelper:
         if group_type == "specie":
 
             self.nspecie = nspecie
-            self.species_mask = np.ones(118, dtype=int) * (nspecie - 1)
 
             # mark the species_mask with atom type
             # default is nspecie-1
+            atom_ns = []
+            types = []
             for idt in range(self.nspecie):
                 for ele in self.groups["specie"][idt]:
-                    atom_n = element_to_Z(ele)
-                    if atom_n >= len(self.species_mask):
-                        new_mask = np.ones(atom_n, dtype=np.int) * (nspecie - 1)
-                        new_mask[: len(self.species_mask)] = self.species_mask
-                        self.species_mask = new_mask
-                    self.species_mask[atom_n] = idt
+                    atom_ns.append(element_to_Z(ele))
+                    types.append(idt)
                     self.logger.debug(
                         f"elemtn {ele} is defined as type {idt} with name {aeg[idt]}"
                     )
             self.logger.debug(f"All the remaining elements are left as type {idt}")
 
+            mask_size = max([118] + [atom_n + 1 for atom_n in atom_ns])
+            self.species_mask = np.full(mask_size, nspecie - 1, dtype=int)
+            self.species_mask[atom_ns] = types
+
         elif group_type in self.all_group_types:
 
             if self.n[group_type] == 0:
@@ -859,28 +888,38 @@ class ParameterHelper:
             ):
                 self.kernels.append(group_type)
 
-            self.mask[group_type] = np.ones(
-                nspecie ** ParameterHelper.ndim[group_type], dtype=int
-            ) * (self.n[group_type] - 1)
+            self.mask[group_type] = np.full(
+                nspecie ** ParameterHelper.ndim[group_type],
+                self.n[group_type] - 1,
+                dtype=int,
+            )
 
             self.hyps_sig[group_type] = []
             self.hyps_ls[group_type] = []
             all_opt_sig = []
             all_opt_ls = []
 
+            # only the entries of sorted species indices are marked while
+            # going through the groups, and copied to all their permutations
+            # afterwards
+            ndim = ParameterHelper.ndim[group_type]
+            mask_shape = (nspecie,) * ndim
             for idt in range(self.n[group_type]):
                 name = aeg[idt]
-                for ele_list in self.groups[group_type][idt]:
-                    # generate all possible permutation
-                    perms = list(permutations(ele_list))
-                    for ele_list in perms:
-                        mask_id = 0
-                        for ele in ele_list:
-                            mask_id += ele
-                            mask_id *= nspecie
-                        mask_id = mask_id // nspecie
-                        self.mask[group_type][mask_id] = idt
-                    def_str = "-".join(map(str, self.groups["specie"]))
+                # mark every definition of the group at once; groups are
+                # written in order, so the later ones override the former
+                definitions = np.array(
+                    self.groups[group_type][idt], dtype=np.intp
+                ).reshape(-1, ndim)
+                mask_ids = np.ravel_multi_index(
+                    np.sort(definitions, axis=1).T, mask_shape
+                )
+                self.mask[group_type][mask_ids] = idt
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    def_str = ", ".join(
+                        "-".join(map(str, ele_list))
+                        for ele_list in self.groups[group_type][idt]
+                    )
                     self.logger.debug(
                         f"{group_type} {def_str} is defined as type {idt} "
                         f"with name {name}"
@@ -919,6 +958,10 @@ class ParameterHelper:
                         f"{ls:6.2g} {opt_sig} {opt_ls}"
                     )
             self.hyps_opt[group_type] = all_opt_sig + all_opt_ls
+
+            all_ids = np.indices(mask_shape).reshape(ndim, -1)
+            sorted_ids = np.ravel_multi_index(np.sort(all_ids, axis=0), mask_shape)
+            self.mask[group_type] = self.mask[group_type][sorted_ids]
             self.logger.debug(f"All the remaining elements are left as type {idt}")
 
             # sort out the cutoffs
@@ -950,13 +993,10 @@ class ParameterHelper:
                             f" reset it to {universal_cutoff}"
                         )
 
-                    self.cutoff_list[group_type] = []
-                    for idt in range(self.n[group_type]):
-                        self.cutoff_list[group_type] += [
-                            self.all_cutoff.get(aeg[idt], universal_cutoff)
-                        ]
-                    self.cutoff_list[group_type] = np.array(
-                        self.cutoff_list[group_type], dtype=float
+                    self.cutoff_list[group_type] = np.fromiter(
+                        (self.all_cutoff.get(name, universal_cutoff) for name in aeg),
+                        dtype=float,
+                        count=self.n[group_type],
                     )
 
                     max_cutoff = np.max(self.cutoff_list[group_type])
@@ -1025,16 +1065,17 @@ class ParameterHelper:
         if self.n["specie"] > 1:
             hyps_mask["species_mask"] = self.species_mask
 
+        # hyperparameters are collected by group and joined once at the end
         hyps = []
+        n_hyps = 0
         hyp_labels = []
         opt = []
         for group in self.kernels:
 
             hyps_mask["n" + group] = self.n[group]
-            hyps_mask[group + "_start"] = len(hyps)
-            hyps += [self.hyps_sig[group]]
-            hyps += [self.hyps_ls[group]]
-            hyps = list(np.hstack(hyps))
+            hyps_mask[group + "_start"] = n_hyps
+            hyps += [self.hyps_sig[group], self.hyps_ls[group]]
+            n_hyps += len(self.hyps_sig[group]) + len(self.hyps_ls[group])
             opt += [self.hyps_opt[group]]
             cutoff_dict[group] = self.universal["cutoff_" + group]
 
@@ -1072,17 +1113,12 @@ class ParameterHelper:
 
         # handle partial optimization if any constraints are defined
         if not opt.all():
-            nhyps = len(hyps)
             hyps_mask["original_hyps"] = hyps
             hyps_mask["original_labels"] = hyp_labels
-            mapping = []
-            new_labels = []
-            for i in range(nhyps):
-                if opt[i]:
-                    mapping += [i]
-                    new_labels += [hyp_labels[i]]
+            mapping = np.flatnonzero(opt)
+            new_labels = [hyp_labels[i] for i in mapping]
             newhyps = hyps[mapping]
-            hyps_mask["map"] = np.array(mapping, dtype=int)
+            hyps_mask["map"] = mapping
         elif opt.any():
             newhyps = hyps
             new_labels = hyp_labels
@@ -1109,7 +1145,7 @@ class ParameterHelper:
         return hyps_mask
 
     @staticmethod
-    def from_dict(hyps_mask, verbose=False, init_spec=[]):
+    def from_dict(hyps_mask, verbose="WARNING", init_spec=[]):
         """convert dictionary mask to HM instance
         This function is not tested yet
         """
@@ -1136,7 +1172,7 @@ class ParameterHelper:
                             else:
                                 pm.define_group("specie", i, [elename])
         else:
-            pm.define_group("specie", i, ["*"])
+            pm.define_group("specie", "*", ["*"])
 
         for kernel in hyps_mask["kernels"] + ParameterHelper.cutoff_types_keys:
             n = hyps_mask.get("n" + kernel, 0)
@@ -1195,7 +1231,9 @@ class ParameterHelper:
                     )
                     if kernel not in ParameterHelper.cutoff_types_keys:
                         pm.set_parameters(
-                            kernel, parameters=np.hstack([sig, ls, cutoff]), opt=copt
+                            kernel,
+                            parameters=np.hstack([sig, ls, cutoff]),
+                            opt=[csig[0], cls[0]],
                         )
                     else:
                         pm.set_parameters(kernel, parameters=cutoff)
@@ -19,6 +19,7 @@ setuptools.setup(
     url="https://github.com/mir-group/flare",
     python_requires=">=3.6",
     install_requires=dependencies,
+    extras_require={"orjson": ["orjson"]},
     license="MIT",
     classifiers=[
         "License :: OSI Approved :: MIT License",
@@ -148,6 +148,29 @@ class TestDataUpdating:
         assert len(test_gp.training_data) == params["noa"] + oldsize
         assert len(test_gp.training_labels_np) == (params["noa"] + oldsize) * 3
 
+    @pytest.mark.parametrize("multihyps", multihyps_list)
+    def test_add_envs(self, all_gps, multihyps, params):
+
+        test_gp = all_gps[multihyps]
+        oldsize = len(test_gp.training_data)
+
+        test_structure, forces = get_random_structure(
+            params["cell"], params["unique_species"], params["noa"]
+        )
+        envs = [
+            AtomicEnvironment(test_structure, atom, test_gp.cutoffs, test_gp.hyps_mask)
+            for atom in range(params["noa"])
+        ]
+        test_gp.add_envs(envs, forces)
+
+        assert len(test_gp.training_data) == params["noa"] + oldsize
+        assert len(test_gp.all_labels) == len(test_gp.training_labels_np) + len(
+            test_gp.energy_labels_np
+        )
+        assert np.allclose(
+            test_gp.training_labels_np[-3 * params["noa"] :], forces.flatten()
+        )
+
 
 class TestTraining:
     @pytest.mark.parametrize("par, n_cpus", [(False, 1), (True, 2)])
@@ -251,6 +274,25 @@ class TestAlgebra:
         assert isinstance(pred[0], float)
         assert isinstance(pred[1], float)
 
+    @pytest.mark.parametrize("multihyps", multihyps_list)
+    def test_predict_force_xyz(self, all_gps, validation_env, multihyps):
+        test_gp = all_gps[multihyps]
+        forces, variances = test_gp.predict_force_xyz(validation_env)
+        for d in range(3):
+            force, variance = test_gp.predict(x_t=validation_env, d=d + 1)
+            assert np.isclose(forces[d], force)
+            assert np.isclose(variances[d], variance)
+
+    @pytest.mark.parametrize("multihyps", multihyps_list)
+    def test_predict_forces_xyz(self, all_gps, validation_env, multihyps):
+        test_gp = all_gps[multihyps]
+        forces, variances = test_gp.predict_forces_xyz([validation_env] * 2)
+        force, variance = test_gp.predict_force_xyz(validation_env)
+        assert forces.shape == variances.shape == (2, 3)
+        for i in range(2):
+            assert np.allclose(forces[i], force)
+            assert np.allclose(variances[i], variance)
+
     @pytest.mark.parametrize(
         "par, per_atom_par, n_cpus",
         [(False, False, 1), (True, True, 2), (True, False, 2)],
@@ -313,6 +355,51 @@ class TestAlgebra:
 
         assert np.all(np.absolute(ky_mat_from_update - ky_mat_from_set)) < 1e-6
 
+    def test_update_L_alpha_forces_only(self, params):
+        # Without energy labels, L and the inverse covariance matrix are
+        # extended rather than recomputed
+        hyps, hm, cutoffs = generate_hm(1, 1, multihyps=False)
+        test_gp = GaussianProcess(
+            kernels=hm["kernels"], hyps=hyps, cutoffs=cutoffs, hyps_mask=hm
+        )
+        test_structure, forces = get_random_structure(
+            params["cell"], params["unique_species"], 4
+        )
+        test_gp.update_db(test_structure, forces, custom_range=[0, 1])
+        test_gp.set_L_alpha()
+        test_gp.update_db(test_structure, forces, custom_range=[2, 3])
+        test_gp.update_L_alpha()
+
+        l_mat, ky_mat_inv, alpha = test_gp.l_mat, test_gp.ky_mat_inv, test_gp.alpha
+        test_gp.set_L_alpha()
+
+        assert np.allclose(l_mat, test_gp.l_mat)
+        assert np.allclose(ky_mat_inv, test_gp.ky_mat_inv)
+        assert np.allclose(alpha, test_gp.alpha)
+
+        # Nothing is recomputed if the training set did not change
+        ky_mat = test_gp.ky_mat
+        test_gp.update_L_alpha()
+        assert test_gp.ky_mat is ky_mat
+        assert np.allclose(alpha, test_gp.alpha)
+
+        # A training set of the same size assigned directly is recomputed
+        other_structure, other_forces = get_random_structure(
+            params["cell"], params["unique_species"], 4
+        )
+        other_gp = GaussianProcess(
+            kernels=hm["kernels"], hyps=hyps, cutoffs=cutoffs, hyps_mask=hm
+        )
+        other_gp.update_db(other_structure, other_forces)
+        other_gp.set_L_alpha()
+        test_gp.training_data = other_gp.training_data
+        test_gp.training_labels = other_gp.training_labels
+        test_gp.training_labels_np = other_gp.training_labels_np
+        test_gp.all_labels = other_gp.all_labels
+        test_gp.update_L_alpha()
+        assert np.allclose(test_gp.ky_mat, other_gp.ky_mat)
+        assert np.allclose(test_gp.alpha, other_gp.alpha)
+
 
 class TestIO:
     @pytest.mark.parametrize("multihyps", multihyps_list)
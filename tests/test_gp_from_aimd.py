@@ -9,13 +9,14 @@ from glob import glob
 from os import remove, path
 
 from flare.env import AtomicEnvironment
-from flare.struc import Structure
+from flare.struc import Structure, Trajectory
 from flare.gp import GaussianProcess
 from flare.mgp import MappedGaussianProcess
 from flare.utils.element_coder import Z_to_element
 from flare.gp_from_aimd import (
     TrajectoryTrainer,
     parse_trajectory_trainer_output,
+    iterate_trajectory_trainer_output,
     structures_from_gpfa_output,
 )
 from flare.utils.learner import subset_of_frame_by_element
@@ -99,6 +100,149 @@ def test_load_trained_gp_and_run(methanol_gp):
         remove(f)
 
 
+def test_run_batched_predictions(methanol_gp):
+    with open(path.join(TEST_FILE_DIR, "methanol_frames.json"), "r") as f:
+        frames = [Structure.from_dict(loads(s)) for s in f.readlines()]
+
+    plans = []
+    for predict_batch_size in [1, 3]:
+        tt = TrajectoryTrainer(
+            frames,
+            gp=deepcopy(methanol_gp),
+            rel_std_tolerance=0,
+            abs_std_tolerance=0,
+            abs_force_tolerance=0.5,
+            max_atoms_from_frame=1,
+            skip=2,
+            validate_ratio=0.5,
+        )
+        tt.run(predict_batch_size=predict_batch_size)
+        with open("gp_from_aimd_training_plan.json", "r") as f:
+            plans.append(json.load(f))
+
+    # Predictions made ahead of time are discarded when the GP is updated
+    assert plans[0] and plans[0] == plans[1]
+
+    for f in glob(f"gp_from_aimd*"):
+        remove(f)
+
+
+def test_active_learning_batched_predictions(methanol_gp):
+    with open(path.join(TEST_FILE_DIR, "methanol_frames.json"), "r") as f:
+        frames = [Structure.from_dict(loads(s)) for s in f.readlines()]
+
+    forces = [frame.forces.copy() for frame in frames]
+    stds = [frame.stds.copy() for frame in frames]
+
+    plans = []
+    gp_sizes = []
+    pred_forces = []
+    for predict_batch_size in [1, 3]:
+        gp_model = deepcopy(methanol_gp)
+        tt = TrajectoryTrainer(gp=gp_model)
+        tt.run_active_learning(
+            frames,
+            rel_std_tolerance=0,
+            abs_std_tolerance=0,
+            abs_force_tolerance=0.1,
+            max_atoms_from_frame=1,
+            min_atoms_per_train=np.inf,
+            validate_ratio=0.3,
+            post_write=False,
+            predict_batch_size=predict_batch_size,
+        )
+        with open("gp_from_aimd_training_plan.json", "r") as f:
+            plans.append(json.load(f))
+        gp_sizes.append(len(gp_model))
+        pred_forces.append(tt.pred_forces)
+
+    # Predictions made ahead of time are discarded when the GP is updated
+    assert len(plans[0]) > 1 and gp_sizes[0] > len(methanol_gp)
+    assert gp_sizes[0] == gp_sizes[1]
+    assert plans[0].keys() == plans[1].keys()
+    for frame, entries in plans[0].items():
+        for entry, batched_entry in zip(entries, plans[1][frame]):
+            assert entry[0] == batched_entry[0]
+            assert np.allclose(entry[1], batched_entry[1])
+            assert np.allclose(entry[2], batched_entry[2])
+    assert np.allclose(pred_forces[0], pred_forces[1])
+
+    # The frames passed in are left unchanged
+    for frame, frame_forces, frame_stds in zip(frames, forces, stds):
+        assert np.array_equal(frame.forces, frame_forces)
+        assert np.array_equal(frame.stds, frame_stds)
+
+    for f in glob(f"gp_from_aimd*"):
+        remove(f)
+
+
+@pytest.mark.parametrize("method", ["run", "run_active_learning"])
+def test_pool_closed_on_failure(methanol_gp, monkeypatch, method):
+    with open(path.join(TEST_FILE_DIR, "methanol_frames.json"), "r") as f:
+        frames = [Structure.from_dict(loads(s)) for s in f.readlines()]
+
+    gp_model = deepcopy(methanol_gp)
+    gp_model.parallel = True
+    gp_model.per_atom_par = True
+    tt = TrajectoryTrainer(
+        frames,
+        gp=gp_model,
+        rel_std_tolerance=0,
+        abs_std_tolerance=0,
+        abs_force_tolerance=0.01,
+        n_cpus=2,
+    )
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("update failed")
+
+    monkeypatch.setattr(tt, "update_gp_and_print", fail)
+    with pytest.raises(RuntimeError):
+        if method == "run":
+            tt.run()
+        else:
+            tt.run_active_learning(
+                frames,
+                rel_std_tolerance=0,
+                abs_std_tolerance=0,
+                abs_force_tolerance=0.01,
+            )
+    assert tt._pool is None
+
+    # The plan of the frame written before the failure is kept
+    with open("gp_from_aimd_training_plan.json", "r") as f:
+        plan = json.load(f)
+    assert list(plan) == ["0"] and plan["0"]
+
+    for f in glob(f"gp_from_aimd*"):
+        remove(f)
+
+
+@pytest.mark.parametrize("method", ["run", "run_active_learning"])
+def test_dft_forces_restored_on_failure(methanol_gp, monkeypatch, method):
+    with open(path.join(TEST_FILE_DIR, "methanol_frames.json"), "r") as f:
+        frames = [Structure.from_dict(loads(s)) for s in f.readlines()]
+    dft_forces = frames[0].forces.copy()
+
+    tt = TrajectoryTrainer(frames, gp=deepcopy(methanol_gp))
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("output failed")
+
+    monkeypatch.setattr(tt.output, "write_gp_dft_comparison", fail)
+    with pytest.raises(RuntimeError):
+        if method == "run":
+            tt.run()
+        else:
+            # A trajectory is predicted on without copying its frames
+            tt.run_active_learning(Trajectory(frames))
+
+    assert np.array_equal(frames[0].forces, dft_forces)
+
+    for f in glob(f"gp_from_aimd*"):
+        remove(f)
+
+
 def test_load_one_frame_and_run():
     the_gp = GaussianProcess(
         kernel_name="2+3_mc",
@@ -362,6 +506,14 @@ def test_parse_gpfa_output():
         assert np.array_equal(struc.positions, frame["positions"])
         assert np.array_equal(struc.forces, frame["dft_forces"])
 
+    # Frames read lazily match the ones read at once
+    lazy_frames = iterate_trajectory_trainer_output(
+        path.join(TEST_FILE_DIR, "gpfa_parse_test.out")
+    )
+    for lazy_frame, frame in zip(lazy_frames, frames):
+        assert lazy_frame["added_atoms"] == frame["added_atoms"]
+        assert np.array_equal(lazy_frame["positions"], frame["positions"])
+
 
 def test_passive_learning():
     the_gp = GaussianProcess(
@@ -483,6 +635,14 @@ def test_active_learning_simple_run():
     prev_carbon_atoms = prev_gp_stats["envs_by_species"]["C"]
     assert the_gp.training_statistics["envs_by_species"]["C"] == prev_carbon_atoms + 1
 
+    # Test that the training plan maps frames to [atom, stds, errors]
+    with open("gp_from_aimd_training_plan.json", "r") as f:
+        plan = json.load(f)
+    assert list(plan) == ["0"]
+    assert len(plan["0"]) == 1
+    atom, stds, errors = plan["0"][0]
+    assert np.shape(stds) == np.shape(errors) == (3,)
+
     prev_gp_len = len(the_gp)
     tt.run_active_learning(
         frames[3:4],
@@ -504,5 +664,23 @@ def test_active_learning_simple_run():
     )
     assert len(the_gp) == prev_gp_len
 
+    # Test that validation frames, which are predicted on in batches,
+    # do not add atoms
+    tt.predict_dtype = np.float32
+    tt.run_active_learning(
+        frames[:5],
+        rel_std_tolerance=0,
+        abs_std_tolerance=0,
+        abs_force_tolerance=0.1,
+        validate_ratio=1,
+        predict_batch_size=2,
+    )
+    assert len(the_gp) == prev_gp_len
+    # Predictions of the run are stored as (frames, atoms, 3) arrays
+    assert tt.pred_forces.shape == tt.pred_stds.shape == (5, frames[0].nat, 3)
+    assert tt.pred_forces.dtype == tt.pred_stds.dtype == np.float32
+    assert tt.dft_forces.dtype == np.float64
+    assert np.allclose(tt.dft_forces[2], frames[2].forces)
+
     for f in glob(f"gp_from_aimd*"):
         remove(f)
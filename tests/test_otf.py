@@ -1,4 +1,5 @@
 import pytest
+import json
 import os
 
 import glob, os, re, shutil
@@ -277,3 +278,50 @@ def test_otf_parser_from_checkpt(software):
         if f"{casename}_otf_{software}" in f:
             shutil.move(f, outdir)
     cleanup(software, f"{casename}_otf_{software}")
+
+
+@pytest.mark.parametrize("output_flush_every", [0, -1])
+def test_invalid_output_flush_every(output_flush_every):
+    with pytest.raises(ValueError):
+        OTF(dt, number_of_steps, gp=get_gp(), output_flush_every=output_flush_every)
+
+
+def test_checkpoint_encoded_once(monkeypatch):
+    """The None fields of as_dict should not force a second encoding with
+    json.dumps when orjson is installed."""
+
+    from flare.utils import element_coder
+
+    if not element_coder._orjson_present:
+        pytest.skip("orjson is not installed")
+
+    def fail_dumps(*args, **kwargs):
+        raise AssertionError("json.dumps should not be called")
+
+    encodings = []
+
+    def count_dumps(*args, **kwargs):
+        encodings.append(args[0])
+        return orjson_dumps(*args, **kwargs)
+
+    orjson_dumps = element_coder.orjson.dumps
+    monkeypatch.setattr(element_coder, "dumps", fail_dumps)
+    monkeypatch.setattr(element_coder.orjson, "dumps", count_dumps)
+
+    otf = OTF(
+        dt,
+        number_of_steps,
+        gp=get_gp(),
+        force_source="qe",
+        dft_input="./test_files/qe_input_1.in",
+        output_name="checkpt_once",
+    )
+    assert None in otf.as_dict().values()
+    otf.checkpoint()
+
+    assert len(encodings) == 1
+    with open("checkpt_once_checkpt.json", "r") as f:
+        assert json.load(f)["dft_kwargs"] is None
+
+    for f in glob.glob("checkpt_once*"):
+        os.remove(f)
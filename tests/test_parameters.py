@@ -194,6 +194,30 @@ def test_generate_by_line():
     Parameters.check_instantiation(hm["hyps"], hm["cutoffs"], hm["kernels"], hm)
 
 
+def test_generate_by_line_atomic_star():
+    """
+    "*" can be mixed with element names, see define_group example 3.2
+    """
+
+    masks = []
+    for elements in [["H", "H"], ["H", "*"]]:
+        pm = ParameterHelper(verbose="DEBUG")
+        pm.define_group("specie", "1", ["H"])
+        pm.define_group("specie", "2", ["O"])
+        pm.define_group("twobody", "Hgroup", elements, atomic_str=True)
+        if elements == ["H", "H"]:
+            pm.define_group("twobody", "Hgroup", ["H", "O"], atomic_str=True)
+        pm.define_group("twobody", "OO", ["O", "O"], atomic_str=True)
+        pm.set_parameters("Hgroup", [1, 0.5])
+        pm.set_parameters("OO", [1, 0.5])
+        pm.set_parameters("cutoff_twobody", 5)
+        hm = pm.as_dict()
+        Parameters.check_instantiation(hm["hyps"], hm["cutoffs"], hm["kernels"], hm)
+        masks.append(hm["twobody_mask"])
+
+    assert np.array_equal(masks[0], masks[1])
+
+
 def test_generate_by_line2():
 
     pm = ParameterHelper(verbose="DEBUG")
@@ -396,3 +420,30 @@ def test_check_one_conflict():
             random=False,
             verbose="DEBUG",
         )
+
+
+def test_check_asymmetric_mask():
+    """
+    masks have to be unchanged by permutations of the species
+    """
+    pm = ParameterHelper(
+        species=["O", "C", "H"],
+        kernels=["twobody", "threebody"],
+        allseparate=True,
+        ones=True,
+        parameters={"cutoff_twobody": 2, "cutoff_threebody": 1, "noise": 0.05},
+        verbose="DEBUG",
+    )
+    hm = pm.as_dict()
+    Parameters.check_instantiation(hm["hyps"], hm["cutoffs"], hm["kernels"], hm)
+
+    for kernel in ["twobody", "threebody"]:
+        # change the group of only one ordering of the first pair / triplet
+        mask = np.array(hm[f"{kernel}_mask"])
+        mask[1] = (mask[1] + 1) % hm[f"n{kernel}"]
+        broken = dict(hm)
+        broken[f"{kernel}_mask"] = mask
+        with raises(AssertionError):
+            Parameters.check_instantiation(
+                hm["hyps"], hm["cutoffs"], hm["kernels"], broken
+            )
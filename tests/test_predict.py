@@ -11,6 +11,7 @@ from flare.predict import (
     predict_on_structure_par,
     predict_on_atom,
     predict_on_atom_en,
+    predict_on_atoms_en,
     predict_on_structure_par_en,
 )
 
@@ -20,6 +21,8 @@ from flare.predict import (
     predict_on_structure_par,
     predict_on_structure_efs,
     predict_on_structure_efs_par,
+    predict_on_structure_en,
+    predict_on_structures_par,
 )
 import pytest
 import time
@@ -29,6 +32,15 @@ def fake_predict(_, __):
     return np.random.uniform(-1, 1), np.random.uniform(-1, 1)
 
 
+def fake_predict_force_xyz(_):
+    return np.random.uniform(-1, 1, size=3), np.random.uniform(-1, 1, size=3)
+
+
+def fake_predict_forces_xyz(envs):
+    size = (len(envs), 3)
+    return np.random.uniform(-1, 1, size=size), np.random.uniform(-1, 1, size=size)
+
+
 def fake_predict_local_energy(_):
     return np.random.uniform(-1, 1)
 
@@ -64,6 +76,8 @@ _fake_structure = Structure(
     cell=np.eye(3), species=[1, 1, 1], positions=np.random.uniform(0, 1, size=(3, 3))
 )
 _fake_gp.predict = fake_predict
+_fake_gp.predict_force_xyz = fake_predict_force_xyz
+_fake_gp.predict_forces_xyz = fake_predict_forces_xyz
 _fake_gp.predict_local_energy = fake_predict_local_energy
 
 assert isinstance(_fake_gp.predict(1, 1), tuple)
@@ -211,6 +225,36 @@ def test_predict_efs(two_plus_three_gp):
     assert np.equal(stress_stds, test_structure.partial_stress_stds).all()
 
 
+@pytest.mark.parametrize("n_cpus", [1, 2])
+@pytest.mark.parametrize("energy", [True, False])
+def test_predict_on_structures_par(two_plus_three_gp, n_cpus, energy):
+    structures = [get_random_structure(np.eye(3), [1, 2], 3)[0] for _ in range(3)]
+    selective_atoms = [None, [1], [0, 2]]
+
+    predictions = predict_on_structures_par(
+        structures,
+        two_plus_three_gp,
+        n_cpus=n_cpus,
+        selective_atoms=selective_atoms,
+        skipped_atom_value=np.nan,
+        energy=energy,
+    )
+
+    assert len(predictions) == len(structures)
+    pred_func = predict_on_structure_en if energy else predict_on_structure
+    for structure, atoms, prediction in zip(structures, selective_atoms, predictions):
+        expected = pred_func(
+            structure,
+            two_plus_three_gp,
+            write_to_structure=False,
+            selective_atoms=atoms,
+            skipped_atom_value=np.nan,
+        )
+        assert len(prediction) == len(expected)
+        for pred, exp in zip(prediction, expected):
+            assert np.allclose(pred, exp, equal_nan=True)
+
+
 def test_predict_on_atoms():
     pred_at_result = predict_on_atom((_fake_structure, 0, _fake_gp))
     assert len(pred_at_result) == 2
@@ -226,6 +270,11 @@ def test_predict_on_atoms():
     assert len(pred_at_en_result[0]) == len(pred_at_result[1]) == 3
     assert isinstance(pred_at_en_result[2], float)
 
+    # Test a block of atoms returns one row per atom
+    forces, stds, energies = predict_on_atoms_en((_fake_structure, [0, 2], _fake_gp))
+    assert forces.shape == stds.shape == (2, 3)
+    assert energies.shape == (2,)
+
 
 @pytest.mark.parametrize("n_cpus", [1, 2, None])
 @pytest.mark.parametrize(
@@ -1,14 +1,20 @@
 import numpy as np
+import json
 import pytest
 
 from pytest import raises
 
 from flare.struc import Structure
-from flare.utils.element_coder import element_to_Z, Z_to_element
+import flare.utils.element_coder as element_coder
+from flare.utils.element_coder import element_to_Z, Z_to_element, numpy_dumps
 from flare.utils.learner import (
+    is_std_in_bound,
     is_std_in_bound_per_species,
     is_force_in_bound_per_species,
+    evaluate_training_atoms,
     subset_of_frame_by_element,
+    indices_by_species,
+    force_errors,
 )
 
 from tests.test_gp import get_random_structure
@@ -41,6 +47,32 @@ def test_Z_to_element():
         Z_to_element("a")
 
 
+def test_std_in_bound():
+    test_structure, _ = get_random_structure(np.eye(3), ["H", "O"], 4)
+    test_structure.stds = np.array([[1, 0, 0], [0, 4, 0], [2, 0, 0], [0, 0, 3]])
+
+    result, target_atoms = is_std_in_bound(0, 1, test_structure)
+    assert result is True and target_atoms == [-1]
+    result, target_atoms = is_std_in_bound(1, 5, test_structure)
+    assert result is True and target_atoms == [-1]
+    result, target_atoms = is_std_in_bound(-5, 0, test_structure)
+    assert result is True and target_atoms == [-1]
+
+    # highest-uncertainty atoms are returned in ascending order
+    result, target_atoms = is_std_in_bound(1, 3.5, test_structure, max_atoms_added=1)
+    assert result is False and target_atoms == [1]
+    result, target_atoms = is_std_in_bound(-3.5, 0, test_structure, max_atoms_added=3)
+    assert result is False and target_atoms == [2, 3, 1]
+    result, target_atoms = is_std_in_bound(1, 1, test_structure, max_atoms_added=10)
+    assert result is False and target_atoms == [0, 2, 3, 1]
+    result, target_atoms = is_std_in_bound(1, 1, test_structure, max_atoms_added=None)
+    assert result is False and target_atoms == [0, 2, 3, 1]
+    result, target_atoms = is_std_in_bound(
+        1, 1, test_structure, update_style="threshold", update_threshold=1.5
+    )
+    assert result is False and target_atoms == [2, 3, 1]
+
+
 def test_std_in_bound_per_species():
     test_structure, _ = get_random_structure(np.eye(3), ["H", "O"], 3)
     test_structure.species_labels = ["H", "H", "O"]
@@ -160,6 +192,23 @@ def test_std_in_bound_per_species():
     assert result is True and target_atoms == [-1]
 
 
+def test_std_in_bound_skipped_atoms():
+    test_structure, _ = get_random_structure(np.eye(3), ["H", "O"], 3)
+    test_structure.species_labels = ["H", "H", "O"]
+    # Atoms which were not predicted on have NaN uncertainties
+    test_structure.stds = np.array([[np.nan] * 3, [2, np.nan, 0], [1, 0, 0]])
+    result, target_atoms = is_std_in_bound_per_species(
+        rel_std_tolerance=0, abs_std_tolerance=0.5, noise=0, structure=test_structure
+    )
+    assert result is False and target_atoms == [1, 2]
+
+    test_structure.stds = np.full((3, 3), np.nan)
+    result, target_atoms = is_std_in_bound_per_species(
+        rel_std_tolerance=0, abs_std_tolerance=0.5, noise=0, structure=test_structure
+    )
+    assert result is True and target_atoms == [-1]
+
+
 def test_force_in_bound_per_species():
     test_structure, _ = get_random_structure(np.eye(3), ["H", "O"], 3)
     test_structure.species_labels = ["H", "H", "O"]
@@ -276,6 +325,25 @@ def test_force_in_bound_per_species():
     assert result is False and set(target_atoms) == set([1, 2])
 
 
+def test_evaluate_training_atoms_default_max_atoms():
+    test_structure, _ = get_random_structure(np.eye(3), ["H", "O"], 3)
+    test_structure.species_labels = ["H", "H", "O"]
+    test_structure.stds = np.array([[1, 0, 0], [2, 0, 0], [3, 0, 0]])
+    pred_forces = np.zeros((3, 3))
+    dft_forces = np.array([[1, 0, 0], [0, 0, 0], [2, 0, 0]])
+
+    # max_atoms_from_frame defaults to None, i.e. no cap on the atoms added
+    in_bound, train_atoms = evaluate_training_atoms(
+        pred_forces=pred_forces,
+        dft_forces=dft_forces,
+        rel_std_tolerance=0,
+        abs_std_tolerance=1.5,
+        abs_force_tolerance=0.5,
+        structure=test_structure,
+    )
+    assert in_bound is False and train_atoms == [0, 1, 2]
+
+
 def test_subset_of_frame_by_element():
     spec_list = ["H", "H", "O", "O", "O", "C"]
     test_struc_1 = Structure(
@@ -303,3 +371,88 @@ def test_subset_of_frame_by_element():
     assert subset_of_frame_by_element(test_struc_1, {"H": 0, "O": 0, "C": 0}) == []
 
     assert subset_of_frame_by_element(test_struc_1, {"H": 0, "O": 0, "C": 1}) == [5]
+
+
+def test_indices_by_species():
+    spec_list = ["H", "O", "H", "C", "O", "O"]
+    test_struc = Structure(
+        cell=np.eye(3), species=spec_list, positions=np.zeros(shape=(len(spec_list), 3))
+    )
+
+    index_map = indices_by_species(test_struc)
+
+    assert set(index_map.keys()) == {1, 6, 8}
+    assert index_map[1].tolist() == [0, 2]
+    assert index_map[6].tolist() == [3]
+    assert index_map[8].tolist() == [1, 4, 5]
+    for species, indices in index_map.items():
+        assert indices.tolist() == test_struc.indices_of_specie(species)
+
+
+def test_force_errors():
+    pred = np.random.randn(5, 3)
+    label = np.random.randn(5, 3)
+    pred[2, 1] = np.nan
+
+    errors, max_errors = force_errors(pred, label, dtype=np.float32)
+
+    assert errors.dtype == max_errors.dtype == np.float32
+    assert np.allclose(errors, np.abs(pred - label), equal_nan=True)
+    assert np.allclose(
+        max_errors, np.amax(np.abs(pred - label), axis=1), equal_nan=True
+    )
+    assert np.isnan(max_errors[2])
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_numpy_dumps(monkeypatch, use_orjson):
+    if use_orjson and not element_coder._orjson_present:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(element_coder, "_orjson_present", use_orjson)
+
+    obj = {
+        "atoms": np.arange(3),
+        "stds": np.ones((3, 3))[:, ::2],
+        "n": np.int64(2),
+        "error": np.float32(0.5),
+    }
+    assert json.loads(numpy_dumps(obj)) == {
+        "atoms": [0, 1, 2],
+        "stds": [[1.0, 1.0]] * 3,
+        "n": 2,
+        "error": 0.5,
+    }
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_numpy_dumps_non_finite(monkeypatch, use_orjson):
+    if use_orjson and not element_coder._orjson_present:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(element_coder, "_orjson_present", use_orjson)
+
+    obj = {
+        "error": np.float64(np.inf),
+        "stds": np.array([np.nan, 1.0]),
+        "none": None,
+    }
+    loaded = json.loads(numpy_dumps(obj))
+    assert loaded["error"] == np.inf
+    assert np.isnan(loaded["stds"][0]) and loaded["stds"][1] == 1.0
+    assert loaded["none"] is None
+
+
+def test_numpy_dumps_none_uses_orjson(monkeypatch):
+    if not element_coder._orjson_present:
+        pytest.skip("orjson is not installed")
+
+    def fail_dumps(*args, **kwargs):
+        raise AssertionError("json.dumps should not be called")
+
+    monkeypatch.setattr(element_coder, "dumps", fail_dumps)
+
+    obj = {"tolerance": None, "name": "null", "stds": np.ones(2)}
+    assert json.loads(numpy_dumps(obj)) == {
+        "tolerance": None,
+        "name": "null",
+        "stds": [1.0, 1.0],
+    }